@@ -0,0 +1,1077 @@
+# ai.py
+"""
+Jugador automático (IA) de Arsouf.
+
+AIPlayer decide despliegue, movimientos y ataques para un bando y los aplica
+a través del motor de reglas (rules.py). No depende de pygame, de modo que la
+misma IA sirve para la partida con interfaz y para las simulaciones por lotes.
+"""
+import math
+
+import config
+import gettext
+_ = gettext.gettext
+
+from combat import CombatPlanner, combat_odds
+from hexgrid import MOVE_CLASS_FOOT, movement_class
+from rules import opposite_side
+from units import *
+
+
+class TurnContext:
+    """
+    Hechos del tablero que la IA consulta muchas veces durante un turno
+    (posiciones por tipo de unidad, ruta de los bagajes a Arsouf, mapas de
+    influencia y de amenaza).
+
+    Cada hecho se calcula la primera vez que se pide y se guarda hasta que un
+    movimiento lo cambia (ver unit_moved). Un contexto solo sirve para la fase
+    en la que se creó.
+
+    Parámetros:
+        turn (tuple): (turno, bando, fase) en el que es válido
+    """
+    def __init__(self, turn):
+        self.turn = turn
+        self._facts = {}
+
+    def get(self, key, compute):
+        """Devuelve el hecho key, calculándolo con compute() si no está guardado."""
+        if key not in self._facts:
+            self._facts[key] = compute()
+        return self._facts[key]
+
+    def unit_moved(self, unit):
+        """Olvida los hechos que dependen de la posición de unit."""
+        self._facts.pop(("positions", unit.side, type(unit)), None)
+        for key in [key for key in self._facts if key[:2] in (("influence", unit.side), ("threat", unit.side))]:
+            del self._facts[key]
+        # La ruta la cortan los Sarracenos y sale del centro de los bagajes o,
+        # si ya no quedan, del de todo el ejército cruzado
+        baggage = self._facts.get(("positions", config.SIDE_CRUSADERS, Bagaje))
+        follows_army = baggage is not None and not baggage
+        if unit.side == config.SIDE_SARACENS or isinstance(unit, Bagaje) or follows_army:
+            self._facts.pop("route", None)
+
+
+class AIPlayer:
+    """
+    IA de un bando.
+
+    Parámetros:
+        engine (RulesEngine): Motor de reglas de la partida
+        side (str): Bando que controla la IA (SIDE_CRUSADERS o SIDE_SARACENS)
+        rng (random.Random): Generador aleatorio (por defecto, el de la partida)
+    """
+    def __init__(self, engine, side, rng=None):
+        self.engine = engine
+        self.side = side
+        self.rng = rng if rng is not None else engine.state.rng
+        self.stop_event = None  # threading.Event que, activado, corta las búsquedas en curso
+        self._context = None
+
+    @property
+    def grid(self):
+        return self.engine.state.grid
+
+    @property
+    def arsouf_hexes(self):
+        return self.engine.state.arsouf_hexes
+
+    @property
+    def context(self):
+        """TurnContext de la fase actual (se crea uno nuevo al cambiar de fase o de turno)."""
+        state = self.engine.state
+        turn = (state.turn_count, state.current_turn_side, state.turn_phase)
+        if self._context is None or self._context.turn != turn:
+            self._context = TurnContext(turn)
+        return self._context
+
+    def close(self):
+        """Libera los recursos de la IA (AIPlayer no usa ninguno)."""
+
+    def should_stop(self):
+        """True si hay que terminar las búsquedas en curso con lo calculado hasta ahora."""
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def use_engine(self, engine):
+        """
+        Pasa a jugar sobre otro motor (por ejemplo, uno con una copia de la
+        partida). Si la IA usaba el generador aleatorio de la partida, pasa a
+        usar el del nuevo estado.
+        """
+        if self.rng is self.engine.state.rng:
+            self.rng = engine.state.rng
+        self.engine = engine
+        self._context = None
+
+    def _is_enemy_unit(self, unit):
+        """Verifica si una unidad pertenece al bando contrario."""
+        return unit.side != self.side
+
+    # ------------------------------
+    # DESPLIEGUE
+    # ------------------------------
+    def deploy_next_unit(self):
+        """
+        Despliega la siguiente unidad pendiente del bando.
+
+        Devuelve una tupla (unit, row, col), o None si no queda nada por desplegar
+        o no hay posiciones libres.
+        """
+        if not self.engine.state.units_to_deploy[self.side]:
+            return None
+
+        # Obtener todas las posiciones válidas de despliegue
+        valid_positions = []
+        for row in range(self.grid.rows):
+            for col in range(self.grid.cols):
+                if self.grid.grid[row][col] is None and self.grid.is_in_deployment_zone(row, col, self.side):
+                    valid_positions.append((row, col))
+
+        if not valid_positions:
+            return None
+
+        # Estrategia específica según el bando de la IA
+        if self.side == config.SIDE_CRUSADERS:
+            # Estrategia para Cruzados: proteger bagajes cerca del borde derecho
+
+            # Buscar unidades de bagaje para desplegar primero
+            bagaje_units = [u for u in self.engine.state.units_to_deploy[self.side] if isinstance(u, Bagaje)]
+            if bagaje_units:
+                unit = bagaje_units[0]
+                self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                # Posicionar bagajes en el borde derecho (columnas altas)
+                right_edge_positions = [pos for pos in valid_positions if pos[1] >= config.HEX_COLS - 3]
+                if right_edge_positions:
+                    row, col = self.rng.choice(right_edge_positions)
+                else:
+                    row, col = self.rng.choice(valid_positions)
+            else:
+                # Buscar unidades de infantería para formar un muro protector
+                infantry_units = [u for u in self.engine.state.units_to_deploy[self.side] if isinstance(u, Infanteria)]
+                if infantry_units:
+                    unit = infantry_units[0]
+                    self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                    # Posicionar infantería delante de los bagajes
+                    middle_positions = [pos for pos in valid_positions
+                                        if pos[1] >= config.HEX_COLS - 4 and pos[1] < config.HEX_COLS - 2]
+                    if middle_positions:
+                        row, col = self.rng.choice(middle_positions)
+                    else:
+                        row, col = self.rng.choice(valid_positions)
+                else:
+                    # Buscar a Ricardo para mantenerlo cerca de unidades fuertes
+                    ricardo_units = [u for u in self.engine.state.units_to_deploy[self.side] if isinstance(u, Ricardo)]
+                    if ricardo_units:
+                        unit = ricardo_units[0]
+                        self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                        # Posicionar a Ricardo en el centro del despliegue
+                        center_positions = [pos for pos in valid_positions
+                                            if pos[1] >= config.HEX_COLS - 3 and pos[1] < config.HEX_COLS - 1]
+                        if center_positions:
+                            row, col = self.rng.choice(center_positions)
+                        else:
+                            row, col = self.rng.choice(valid_positions)
+                    else:
+                        # Desplegar caballeros y otras unidades en el frente
+                        unit = self.rng.choice(self.engine.state.units_to_deploy[self.side])
+                        self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                        # Posicionar caballeros en el frente
+                        front_positions = [pos for pos in valid_positions if pos[1] < config.HEX_COLS - 2]
+                        if front_positions and (isinstance(unit, Caballero) or isinstance(unit, Templario)
+                                                or isinstance(unit, Hospitalario)):
+                            row, col = self.rng.choice(front_positions)
+                        else:
+                            row, col = self.rng.choice(valid_positions)
+        else:  # SARRACENOS
+            # Estrategia para Sarracenos: rodear a los cruzados
+
+            # Buscar a Saladino para mantenerlo cerca de unidades fuertes
+            saladino_units = [u for u in self.engine.state.units_to_deploy[self.side] if isinstance(u, Saladino)]
+            if saladino_units:
+                unit = saladino_units[0]
+                self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                # Posicionar a Saladino en el centro del despliegue
+                center_positions = [pos for pos in valid_positions if 3 <= pos[1] <= 6]
+                if center_positions:
+                    row, col = self.rng.choice(center_positions)
+                else:
+                    row, col = self.rng.choice(valid_positions)
+            else:
+                # Buscar unidades fuertes (Mamelucos) para el centro
+                mameluco_units = [u for u in self.engine.state.units_to_deploy[self.side] if isinstance(u, Mameluco)]
+                if mameluco_units:
+                    unit = mameluco_units[0]
+                    self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                    # Posicionar Mamelucos en el centro
+                    center_positions = [pos for pos in valid_positions if 2 <= pos[1] <= 7]
+                    if center_positions:
+                        row, col = self.rng.choice(center_positions)
+                    else:
+                        row, col = self.rng.choice(valid_positions)
+                else:
+                    # Buscar arqueros para posicionarlos en los flancos
+                    arquero_units = [u for u in self.engine.state.units_to_deploy[self.side] if isinstance(u, Arquero)]
+                    if arquero_units:
+                        unit = arquero_units[0]
+                        self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                        # Posicionar arqueros en los flancos
+                        flank_positions = [pos for pos in valid_positions if pos[1] <= 2 or pos[1] >= 6]
+                        if flank_positions:
+                            row, col = self.rng.choice(flank_positions)
+                        else:
+                            row, col = self.rng.choice(valid_positions)
+                    else:
+                        # Desplegar exploradores en posiciones avanzadas
+                        unit = self.rng.choice(self.engine.state.units_to_deploy[self.side])
+                        self.engine.state.units_to_deploy[self.side].remove(unit)
+
+                        if isinstance(unit, Explorador):
+                            # Posicionar exploradores en posiciones avanzadas
+                            advanced_positions = [pos for pos in valid_positions if pos[0] < config.HEX_ROWS - 1]
+                            if advanced_positions:
+                                row, col = self.rng.choice(advanced_positions)
+                            else:
+                                row, col = self.rng.choice(valid_positions)
+                        else:
+                            row, col = self.rng.choice(valid_positions)
+
+        # Añadir la unidad al tablero
+        self.engine.deploy(unit, row, col)
+        return unit, row, col
+
+    def deploy_all(self):
+        """Despliega todas las unidades pendientes del bando."""
+        while self.deploy_next_unit():
+            pass
+
+    # ------------------------------
+    # TURNO
+    # ------------------------------
+    def movement_order(self):
+        """
+        Devuelve las unidades del bando como tuplas (row, col, unit) en orden de
+        prioridad estratégica. Las unidades se mueven sacándolas del final de la lista.
+        """
+        # Obtener todas las unidades de la IA
+        all_ai_units = self.grid.unit_positions(self.side)
+
+        # Ordenar unidades según prioridad estratégica
+        if self.side == config.SIDE_CRUSADERS:
+            # Para Cruzados: primero mover Ricardo y unidades fuertes, luego infantería, bagajes al final
+            leaders = [(r, c, u) for r, c, u in all_ai_units if isinstance(u, Ricardo)]
+            strong_units = [(r, c, u) for r, c, u in all_ai_units
+                            if isinstance(u, Templario) or isinstance(u, Hospitalario) or isinstance(u, Caballero)]
+            infantry = [(r, c, u) for r, c, u in all_ai_units if isinstance(u, Infanteria)]
+            baggage = [(r, c, u) for r, c, u in all_ai_units if isinstance(u, Bagaje)]
+
+            # Ordenar por prioridad
+            return leaders + strong_units + infantry + baggage
+        else:  # SARRACENOS
+            # Para Sarracenos: primero mover exploradores, luego arqueros, mamelucos y Saladino
+            leaders = [(r, c, u) for r, c, u in all_ai_units if isinstance(u, Saladino)]
+            explorers = [(r, c, u) for r, c, u in all_ai_units if isinstance(u, Explorador)]
+            archers = [(r, c, u) for r, c, u in all_ai_units if isinstance(u, Arquero)]
+            mamelucos = [(r, c, u) for r, c, u in all_ai_units if isinstance(u, Mameluco)]
+
+            # Ordenar por prioridad
+            return explorers + archers + mamelucos + leaders
+
+    def move_unit(self, row, col, unit):
+        """
+        Elige y aplica el movimiento de una unidad.
+
+        Devuelve una tupla ((new_row, new_col), resultado del motor), o None si la
+        unidad no puede moverse.
+        """
+        if (row, col) in self.engine.state.moved_units:
+            return None
+        possible_moves = self.engine.legal_moves(row, col)
+        if not possible_moves:
+            return None
+
+        # Elegir movimiento según estrategia (None: la unidad se queda donde está)
+        new_pos = self.choose_strategic_move(row, col, unit, possible_moves)
+        if new_pos is None:
+            return None
+        result = self.engine.move((row, col), new_pos)
+        if result:
+            self.context.unit_moved(unit)
+        return new_pos, result
+
+    def combat_order(self):
+        """
+        Devuelve las unidades que pueden atacar: primero las del plan de combate
+        (CombatPlanner), en su orden, y después el resto en orden de prioridad
+        estratégica, por si los resultados reales de los dados las hacen útiles.
+        """
+        all_ai_units = self.grid.unit_positions(self.side)
+        prioritized = self._prioritize_units_for_combat(all_ai_units)
+        planned = [attacker for attacker, _target in self._combat_planner().plan(self.engine.state.attacked_units)]
+        return [(u.row, u.col, u) for u in planned] + [(r, c, u) for r, c, u in prioritized if u not in planned]
+
+    def _combat_planner(self):
+        """CombatPlanner de la fase de combate actual, guardado en el contexto del turno."""
+        def build():
+            attacked = self.engine.state.attacked_units
+            attackers = [u for r, c, u in self.grid.unit_positions(self.side) if (r, c) not in attacked]
+            return CombatPlanner(attackers, self.grid, self._target_score, self._unit_value, stop=self.should_stop)
+        return self.context.get("combat_planner", build)
+
+    def attack_with(self, row, col, unit):
+        """
+        Ataca con la unidad en (row, col) al mejor objetivo adyacente.
+
+        Devuelve una tupla (objetivo, AttackResult), o None si la unidad no puede atacar.
+        """
+        # Verificar si la unidad ya atacó este turno
+        if (row, col) in self.engine.state.attacked_units:
+            return None
+
+        # Verificar si la unidad sigue existiendo y está sana
+        current_unit = self.grid.get_unit(row, col)
+        if not current_unit or current_unit.health != 2 or current_unit != unit:
+            return None
+
+        # Obtener enemigos adyacentes
+        adjacent_enemies = self.grid.get_adjacent_enemies(row, col, self.side)
+
+        # Si no hay enemigos adyacentes, pasar a la siguiente unidad
+        if not adjacent_enemies:
+            return None
+
+        target = self.choose_combat_target(unit, adjacent_enemies)
+        if not target:
+            return None
+        return target, self.engine.attack((row, col), (target.row, target.col))
+
+    def choose_combat_target(self, unit, adjacent_enemies):
+        """Objetivo según el plan de combate, o None si no conviene atacar."""
+        planner = self._combat_planner()
+        if unit in planner.adjacent:
+            return planner.best_target(unit, self.engine.state.attacked_units)
+        return self.select_combat_target(unit, adjacent_enemies)
+
+    def play_turn(self):
+        """Juega un turno completo (movimiento y combate) sin pausas ni interfaz."""
+        units_to_consider = self.movement_order()
+        while units_to_consider and not self.engine.state.game_over:
+            self.move_unit(*units_to_consider.pop())
+        if self.engine.state.game_over:
+            return
+
+        self.engine.end_phase()
+        for row, col, unit in self.combat_order():
+            self.attack_with(row, col, unit)
+        self.engine.end_phase()
+
+    # ------------------------------
+    # ESTRATEGIA
+    # ------------------------------
+    def choose_strategic_move(self, row, col, unit, possible_moves):
+        """Elige un movimiento estratégico según el tipo de unidad y el bando."""
+        if self.side == config.SIDE_CRUSADERS:
+            # Estrategia para Cruzados
+            if isinstance(unit, Bagaje):
+                # Bagajes: Priorizar movimiento hacia Arsouf
+                # Verificar si hay un camino directo hacia Arsouf
+                path_to_arsouf = self._find_path_to_arsouf(row, col, possible_moves)
+                if path_to_arsouf:
+                    return path_to_arsouf
+
+                # Si no hay camino directo, mantenerse cerca del borde derecho y alejados de enemigos
+                right_edge_moves = [(r, c) for r, c in possible_moves if c >= config.HEX_COLS - 3]
+                if right_edge_moves:
+                    # Evaluar seguridad: preferir posiciones con menos enemigos cercanos
+                    safest_move = self._find_safest_position(right_edge_moves, unit)
+                    return safest_move
+
+                # Si no hay movimientos hacia el borde derecho, buscar el más seguro
+                return self._find_safest_position(possible_moves, unit)
+
+            elif isinstance(unit, Ricardo):
+                # Ricardo: Priorizar protección de bagajes en camino a Arsouf
+                baggage_positions = self._find_unit_positions(Bagaje)
+                if baggage_positions:
+                    # Verificar si hay bagajes en camino a Arsouf que necesitan protección
+                    baggage_to_protect = self._find_baggage_en_route_to_arsouf(baggage_positions)
+                    if baggage_to_protect:
+                        return self._find_position_to_protect(baggage_to_protect, possible_moves)
+
+                # Si no hay bagajes que proteger, mantenerse cerca de unidades fuertes
+                return self._find_position_near_strong_allies(row, col, possible_moves)
+
+            elif isinstance(unit, Infanteria):
+                # Infantería: Priorizar formación de corredor seguro hacia Arsouf
+                # Verificar si hay un camino hacia Arsouf que necesita protección
+                arsouf_corridor = self._find_corridor_to_arsouf()
+                if arsouf_corridor:
+                    # Posicionarse en el corredor para protegerlo
+                    corridor_positions = self._find_position_in_corridor(arsouf_corridor, possible_moves)
+                    if corridor_positions:
+                        return corridor_positions
+
+                # Si no hay corredor o no podemos posicionarnos en él, proteger bagajes
+                baggage_positions = self._find_unit_positions(Bagaje)
+                if baggage_positions:
+                    # Moverse para proteger bagajes
+                    return self._find_position_to_protect(baggage_positions, possible_moves)
+                else:
+                    # Si no hay bagajes, moverse hacia el frente
+                    return self._find_position_towards_enemy(row, col, possible_moves)
+
+            else:  # Caballeros, Templarios, Hospitalarios
+                # Unidades fuertes: Priorizar escolta de bagajes hacia Arsouf
+                baggage_positions = self._find_unit_positions(Bagaje)
+                if baggage_positions and self.rng.random() < 0.6:  # 60% de probabilidad de proteger bagajes
+                    return self._find_position_to_protect(baggage_positions, possible_moves)
+
+                # Si no hay bagajes o decidimos no protegerlos, proteger a Ricardo
+                ricardo_positions = self._find_unit_positions(Ricardo)
+                if ricardo_positions and self.rng.random() < 0.4:  # 40% de probabilidad de proteger a Ricardo
+                    return self._find_position_near_positions(ricardo_positions, possible_moves)
+                else:
+                    # Avanzar hacia el enemigo
+                    return self._find_position_towards_enemy(row, col, possible_moves)
+        else:  # SARRACENOS
+            # Estrategia para Sarracenos: impedir que los Cruzados lleguen a Arsouf
+            # Los bagajes cruzados (objetivos prioritarios) y el corredor hacia Arsouf
+            # que debemos bloquear se piden solo cuando la unidad los necesita
+
+            if isinstance(unit, Saladino):
+                # Saladino: Coordinar el bloqueo del camino a Arsouf
+                arsouf_corridor = self._find_path_to_block_to_arsouf()
+                if arsouf_corridor and self.rng.random() < 0.7:  # 70% de probabilidad de bloquear el camino
+                    blocking_position = self._find_position_to_block_arsouf(arsouf_corridor, possible_moves)
+                    if blocking_position:
+                        return blocking_position
+
+                # Si no bloqueamos el camino, mantenerse cerca de unidades fuertes (Mamelucos)
+                mameluco_positions = self._find_unit_positions(Mameluco)
+                if mameluco_positions:
+                    return self._find_position_near_positions(mameluco_positions, possible_moves)
+                else:
+                    # Si no hay mamelucos, moverse hacia el centro
+                    return self._find_position_towards_center(possible_moves)
+
+            elif isinstance(unit, Explorador):
+                # Exploradores: Priorizar interceptar bagajes cruzados
+                crusader_baggage = self._find_enemy_baggage()
+                if crusader_baggage:
+                    intercept_position = self._find_position_to_intercept(crusader_baggage, possible_moves)
+                    if intercept_position:
+                        return intercept_position
+
+                # Si no hay bagajes para interceptar, rodear al enemigo por los flancos
+                return self._find_position_to_flank(row, col, possible_moves)
+
+            elif isinstance(unit, Arquero):
+                # Arqueros: Posicionarse para atacar bagajes o bloquear el camino a Arsouf
+                crusader_baggage = self._find_enemy_baggage()
+                if crusader_baggage and self.rng.random() < 0.6:  # 60% de probabilidad de atacar bagajes
+                    attack_position = self._find_position_to_attack_baggage(crusader_baggage, possible_moves)
+                    if attack_position:
+                        return attack_position
+
+                # Si no atacamos bagajes, bloquear el camino a Arsouf
+                arsouf_corridor = self._find_path_to_block_to_arsouf()
+                if arsouf_corridor:
+                    blocking_position = self._find_position_to_block_arsouf(arsouf_corridor, possible_moves)
+                    if blocking_position:
+                        return blocking_position
+
+                # Si no podemos hacer ninguna de las anteriores, mantener distancia media
+                return self._find_position_at_medium_range(row, col, possible_moves)
+
+            else:  # Mamelucos
+                # Mamelucos: Priorizar atacar bagajes cruzados
+                crusader_baggage = self._find_enemy_baggage()
+                if crusader_baggage:
+                    attack_position = self._find_position_to_attack_baggage(crusader_baggage, possible_moves)
+                    if attack_position:
+                        return attack_position
+
+                # Si no hay bagajes para atacar, bloquear el camino a Arsouf
+                arsouf_corridor = self._find_path_to_block_to_arsouf()
+                if arsouf_corridor:
+                    blocking_position = self._find_position_to_block_arsouf(arsouf_corridor, possible_moves)
+                    if blocking_position:
+                        return blocking_position
+
+                # Si no podemos hacer ninguna de las anteriores, avanzar hacia el enemigo
+                return self._find_position_towards_enemy(row, col, possible_moves)
+
+        # Si no se pudo aplicar ninguna estrategia específica, elegir al azar
+        return self.rng.choice(possible_moves)
+
+    def _find_safest_position(self, positions, unit):
+        """
+        Encuentra la posición más segura: la que menos enemigos podrían atacar
+        en su próximo turno y, a igualdad, la que tiene menos enemigos cercanos.
+        """
+        if not positions:
+            return None
+
+        # Evaluar cada posición por la amenaza enemiga y los enemigos cercanos
+        indices = self.grid.flat_indices(positions)
+        attackers = self._enemy_threat().count[indices]
+        enemies_nearby = self._enemy_influence(2).count[indices]
+        position_safety = {pos: (-threat, -count)  # Negativo para ordenar de menos a más enemigos
+                           for pos, threat, count in zip(positions, attackers.tolist(), enemies_nearby.tolist())}
+
+        # Ordenar por seguridad (menos enemigos primero)
+        sorted_positions = sorted(positions, key=lambda pos: position_safety[pos], reverse=True)
+
+        # Devolver la posición más segura, o una aleatoria entre las más seguras
+        safest_positions = [pos for pos in sorted_positions
+                            if position_safety[pos] == position_safety[sorted_positions[0]]]
+        return self.rng.choice(safest_positions)
+
+    def _enemy_influence(self, radius):
+        """InfluenceMap del bando enemigo para el radio dado, guardado en el contexto del turno."""
+        enemy = opposite_side(self.side)
+        return self.context.get(("influence", enemy, radius), lambda: self.grid.influence_map(enemy, radius))
+
+    def _enemy_threat(self):
+        """
+        ThreatMap del bando enemigo, guardado en el contexto del turno.
+        Se calcula con el tablero del principio del turno: los movimientos
+        propios, que solo cambian por dónde puede pasar el enemigo, no lo
+        invalidan.
+        """
+        enemy = opposite_side(self.side)
+        return self.context.get(("threat", enemy), lambda: self.grid.threat_map(enemy))
+
+    def _find_position_near_strong_allies(self, row, col, possible_moves):
+        """Encuentra una posición cerca de aliados fuertes."""
+        # Buscar unidades fuertes aliadas
+        strong_allies = [(r, c) for r, c, unit in self.grid.unit_positions(self.side)
+                         if (isinstance(unit, Templario) or isinstance(unit, Hospitalario)
+                             or isinstance(unit, Caballero) or isinstance(unit, Mameluco))]
+
+        if not strong_allies:
+            return self.rng.choice(possible_moves)
+
+        # Calcular distancia a unidades fuertes
+        move_scores = {}
+        for move in possible_moves:
+            r, c = move
+            # Menor distancia a cualquier unidad fuerte
+            min_distance = min(self.grid.distance(move, ally) for ally in strong_allies)
+            move_scores[move] = -min_distance  # Negativo para ordenar de menor a mayor distancia
+
+        # Ordenar por cercanía a unidades fuertes
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver una de las mejores opciones
+        best_moves = [move for move in sorted_moves[:3]]
+        return self.rng.choice(best_moves if best_moves else possible_moves)
+
+    def _find_unit_positions(self, unit_class, side=None):
+        """Encuentra las posiciones de todas las unidades de un tipo específico (del propio bando por defecto)."""
+        side = side if side is not None else self.side
+        return self.context.get(("positions", side, unit_class), lambda: [
+            (r, c) for r, c, _unit in self.grid.unit_positions(side, unit_class)])
+
+    def _find_position_to_protect(self, positions_to_protect, possible_moves):
+        """Encuentra una posición que ayude a proteger otras unidades."""
+        if not positions_to_protect or not possible_moves:
+            return self.rng.choice(possible_moves)
+
+        # Calcular posición promedio de las unidades a proteger, dando más peso
+        # a las que más enemigos podrían atacar en su próximo turno
+        attackers = self._enemy_threat().count[self.grid.flat_indices(positions_to_protect)]
+        weights = [1 + threat for threat in attackers.tolist()]
+        total_weight = sum(weights)
+        avg_r = sum(r * w for (r, _), w in zip(positions_to_protect, weights)) / total_weight
+        avg_c = sum(c * w for (_, c), w in zip(positions_to_protect, weights)) / total_weight
+
+        # Calcular posiciones que están entre el enemigo y las unidades a proteger
+        move_scores = {}
+        for move in possible_moves:
+            r, c = move
+            # Distancia a la posición promedio
+            dist_to_protect = ((r - avg_r) ** 2 + (c - avg_c) ** 2) ** 0.5
+
+            # Posición relativa respecto al enemigo (preferir posiciones que estén entre el enemigo y las unidades a proteger)
+            enemy_direction = -1 if self.side == config.SIDE_CRUSADERS else 1  # Dirección aproximada del enemigo
+            relative_position = c * enemy_direction  # Valor más alto = más cerca del enemigo
+
+            # Combinar factores: queremos estar cerca pero no demasiado
+            move_scores[move] = relative_position - 0.5 * dist_to_protect
+
+        # Ordenar por puntuación
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver una de las mejores opciones
+        best_moves = [move for move in sorted_moves[:3]]
+        return self.rng.choice(best_moves if best_moves else possible_moves)
+
+    def _find_position_towards_enemy(self, row, col, possible_moves):
+        """Encuentra una posición que avance hacia el enemigo."""
+        if not possible_moves:
+            return None
+
+        # Determinar dirección hacia el enemigo (izquierda para Cruzados, derecha para Sarracenos)
+        enemy_col_direction = -1 if self.side == config.SIDE_CRUSADERS else 1
+
+        # Enemigos a 3 hexágonos o menos de cada movimiento (mapa de influencia)
+        nearby_enemies = self._enemy_influence(3).count[self.grid.flat_indices(possible_moves)]
+
+        # Evaluar movimientos por avance hacia el enemigo
+        move_scores = {}
+        for (r, c), enemy_proximity in zip(possible_moves, nearby_enemies.tolist()):
+            # Avance en la dirección del enemigo
+            col_advance = (c - col) * enemy_col_direction
+
+            # Bonus por acercarse a unidades enemigas
+            move_scores[(r, c)] = col_advance + 0.2 * enemy_proximity
+
+        # Ordenar por puntuación
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver una de las mejores opciones (con algo de aleatoriedad)
+        best_moves = sorted_moves[:max(1, len(sorted_moves) // 3)]
+        return self.rng.choice(best_moves)
+
+    def _find_position_near_positions(self, target_positions, possible_moves):
+        """Encuentra una posición cercana a las posiciones objetivo."""
+        if not target_positions or not possible_moves:
+            return self.rng.choice(possible_moves)
+
+        # Menor distancia de cada movimiento a cualquier posición objetivo (vectorizado)
+        min_distances = self.grid.distance_matrix(possible_moves, target_positions).min(axis=1)
+        move_scores = {move: -int(distance)  # Negativo para ordenar de menor a mayor distancia
+                       for move, distance in zip(possible_moves, min_distances)}
+
+        # Ordenar por cercanía
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver una de las mejores opciones
+        best_moves = [move for move in sorted_moves[:3]]
+        return self.rng.choice(best_moves if best_moves else possible_moves)
+
+    def _find_position_to_flank(self, row, col, possible_moves):
+        """Encuentra una posición que permita flanquear al enemigo."""
+        if not possible_moves:
+            return None
+
+        # Para flanquear, preferimos movernos hacia los lados y avanzar
+        move_scores = {}
+        for r, c in possible_moves:
+            # Avance hacia el enemigo
+            forward_score = (r - row) if self.side == config.SIDE_SARACENS else (row - r)
+
+            # Movimiento lateral (flanqueo)
+            lateral_movement = abs(c - col)
+
+            # Combinar factores
+            move_scores[(r, c)] = forward_score + 0.5 * lateral_movement
+
+        # Ordenar por puntuación
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver una de las mejores opciones
+        best_moves = sorted_moves[:max(1, len(sorted_moves) // 3)]
+        return self.rng.choice(best_moves)
+
+    def _find_position_at_medium_range(self, row, col, possible_moves):
+        """Encuentra una posición a distancia media del enemigo (para arqueros)."""
+        if not possible_moves:
+            return None
+
+        # Buscar unidades enemigas
+        enemy_positions = [(r, c) for r, c, _unit in self.grid.unit_positions(opposite_side(self.side))]
+
+        if not enemy_positions:
+            return self.rng.choice(possible_moves)
+
+        # Calcular distancia óptima (queremos estar a distancia media, ni muy cerca ni muy lejos)
+        optimal_distance = 3  # Distancia ideal para arqueros
+
+        # Distancia de cada movimiento al enemigo más cercano
+        min_distances = self.grid.distance_matrix(possible_moves, enemy_positions).min(axis=1)
+
+        # Penalizar desviaciones de la distancia óptima
+        move_scores = {move: -abs(int(distance) - optimal_distance)
+                       for move, distance in zip(possible_moves, min_distances)}
+
+        # Ordenar por puntuación
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver una de las mejores opciones
+        best_moves = sorted_moves[:max(1, len(sorted_moves) // 3)]
+        return self.rng.choice(best_moves)
+
+    def _find_position_towards_center(self, possible_moves):
+        """Encuentra una posición hacia el centro del tablero."""
+        if not possible_moves:
+            return None
+
+        # Calcular centro del tablero
+        center_r = self.grid.rows // 2
+        center_c = self.grid.cols // 2
+
+        # Evaluar movimientos por cercanía al centro
+        move_scores = {}
+        for move in possible_moves:
+            distance_to_center = self.grid.distance(move, (center_r, center_c))
+            move_scores[move] = -distance_to_center  # Negativo para ordenar de menor a mayor distancia
+
+        # Ordenar por puntuación
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver una de las mejores opciones
+        best_moves = sorted_moves[:max(1, len(sorted_moves) // 3)]
+        return self.rng.choice(best_moves)
+
+    def _find_path_to_arsouf(self, row, col, possible_moves):
+        """Encuentra el mejor movimiento para acercarse a Arsouf."""
+        if not possible_moves:
+            return None
+
+        # Coste real (terreno y enemigos) que le quedaría a la unidad hasta Arsouf
+        move_class = movement_class(self.grid.grid[row][col])
+
+        # Evaluar seguridad (menos enemigos cercanos es mejor)
+        enemy_counts = self._enemy_influence(2).count[self.grid.flat_indices(possible_moves)]
+
+        move_scores = {}
+        for (r, c), enemies_nearby in zip(possible_moves, enemy_counts.tolist()):
+            min_distance = self._arsouf_cost((r, c), move_class)
+
+            # Combinar factores: distancia a Arsouf (más importante) y seguridad
+            move_scores[(r, c)] = -min_distance * 2 - enemies_nearby
+
+        # Ordenar por puntuación (mejor primero)
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver el mejor movimiento, o uno aleatorio entre los mejores
+        best_moves = sorted_moves[:max(1, len(sorted_moves) // 4)]
+        return self.rng.choice(best_moves)
+
+    def _arsouf_cost(self, pos, move_class=MOVE_CLASS_FOOT):
+        """
+        Coste en puntos de movimiento de pos a Arsouf para una unidad cruzada,
+        leído del campo de distancias del tablero (HexGrid.distance_field), que
+        se calcula una vez por turno. Si los Sarracenos cortan todos los caminos,
+        se usa el coste solo por terreno.
+        """
+        index = pos[0] * self.grid.cols + pos[1]
+        cost = self.grid.distance_field(self.arsouf_hexes, move_class, config.SIDE_CRUSADERS)[index]
+        if cost == math.inf:
+            cost = self.grid.distance_field(self.arsouf_hexes, move_class)[index]
+        return cost
+
+    def _find_baggage_en_route_to_arsouf(self, baggage_positions):
+        """Identifica bagajes que están en camino hacia Arsouf y necesitan protección."""
+        if not baggage_positions:
+            return []
+
+        # Filtrar bagajes que están en camino a Arsouf (más cerca que la media)
+        baggage_en_route = []
+
+        # Calcular distancia media de todos los bagajes a Arsouf
+        total_distance = 0
+        for r, c in baggage_positions:
+            min_distance = self._arsouf_cost((r, c))
+            total_distance += min_distance
+
+        avg_distance = total_distance / len(baggage_positions) if baggage_positions else float('inf')
+
+        # Seleccionar bagajes que están más cerca de Arsouf que la media
+        for r, c in baggage_positions:
+            min_distance = self._arsouf_cost((r, c))
+            if min_distance <= avg_distance:
+                baggage_en_route.append((r, c))
+
+        return baggage_en_route
+
+    def _find_corridor_to_arsouf(self):
+        """Identifica un corredor estratégico hacia Arsouf (la ruta de los bagajes)."""
+        return self.context.get("route", self._route_to_arsouf)
+
+    def _route_to_arsouf(self):
+        """
+        Camino más barato de los Cruzados hacia Arsouf, calculado con A* sobre
+        el terreno (HexGrid.find_path) y con los Sarracenos cortando el paso.
+
+        Sale de la unidad más cercana al centro de los bagajes, o de todo el
+        ejército si no quedan bagajes. Cruzados y Sarracenos usan la misma ruta,
+        que el tablero guarda mientras no cambie la ocupación.
+        """
+        crusader_units = [(r, c) for r, c, _unit in self.grid.unit_positions(config.SIDE_CRUSADERS)]
+        if not crusader_units:
+            return []
+
+        # Dar prioridad a los bagajes
+        baggage_units = self._find_unit_positions(Bagaje, config.SIDE_CRUSADERS)
+        group = baggage_units or crusader_units
+        avg_r = sum(r for r, _ in group) / len(group)
+        avg_c = sum(c for _, c in group) / len(group)
+        start = min(group, key=lambda pos: (pos[0] - avg_r) ** 2 + (pos[1] - avg_c) ** 2)
+
+        path = self.grid.find_path(start, self.arsouf_hexes, MOVE_CLASS_FOOT, config.SIDE_CRUSADERS)
+        if path is None:
+            # Camino cortado por los Sarracenos: usar solo el terreno
+            path = self.grid.find_path(start, self.arsouf_hexes, MOVE_CLASS_FOOT)
+        return path or []
+
+    def _find_position_in_corridor(self, corridor, possible_moves):
+        """Encuentra la mejor posición dentro del corredor hacia Arsouf."""
+        if not corridor or not possible_moves:
+            return None
+
+        # Encontrar movimientos que están en el corredor
+        corridor_moves = [move for move in possible_moves if move in corridor]
+
+        if corridor_moves:
+            # Preferir posiciones más cercanas a Arsouf
+            move_scores = {}
+            for r, c in corridor_moves:
+                min_distance = self._arsouf_cost((r, c))
+                move_scores[(r, c)] = -min_distance
+
+            # Ordenar por cercanía a Arsouf
+            sorted_moves = sorted(corridor_moves, key=lambda move: move_scores[move], reverse=True)
+            return sorted_moves[0] if sorted_moves else None
+
+        # Si no hay movimientos en el corredor, encontrar el más cercano al corredor
+        closest_to_corridor = None
+        min_corridor_distance = float('inf')
+
+        for move_r, move_c in possible_moves:
+            for corr_r, corr_c in corridor:
+                dist = self.grid.distance((move_r, move_c), (corr_r, corr_c))
+                if dist < min_corridor_distance:
+                    min_corridor_distance = dist
+                    closest_to_corridor = (move_r, move_c)
+
+        return closest_to_corridor
+
+    def _find_enemy_baggage(self):
+        """Encuentra las posiciones de los bagajes enemigos (Cruzados)."""
+        return self._find_unit_positions(Bagaje, config.SIDE_CRUSADERS)
+
+    def _find_path_to_block_to_arsouf(self):
+        """Identifica el camino más probable que los Cruzados usarán para llegar a Arsouf."""
+        return self.context.get("route", self._route_to_arsouf)
+
+    def _find_position_to_block_arsouf(self, path_to_block, possible_moves):
+        """Encuentra la mejor posición para bloquear el camino a Arsouf."""
+        if not path_to_block or not possible_moves:
+            return None
+
+        # Recorrer el camino desde Arsouf hacia atrás (más cercano primero)
+        sorted_path = path_to_block[::-1]
+
+        # Intentar bloquear el camino lo más cerca posible de Arsouf
+        for path_r, path_c in sorted_path:
+            # Buscar movimientos cercanos a este punto del camino
+            for move_r, move_c in possible_moves:
+                dist = self.grid.distance((move_r, move_c), (path_r, path_c))
+                if dist <= 1:  # Adyacente o en el mismo hexágono
+                    return (move_r, move_c)
+
+        # Si no podemos bloquear directamente, encontrar el movimiento más cercano al camino
+        best_move = None
+        min_dist = float('inf')
+
+        for move_r, move_c in possible_moves:
+            for path_r, path_c in sorted_path[:5]:  # Considerar solo los 5 hexágonos más cercanos a Arsouf
+                dist = self.grid.distance((move_r, move_c), (path_r, path_c))
+                if dist < min_dist:
+                    min_dist = dist
+                    best_move = (move_r, move_c)
+
+        return best_move
+
+    def _find_position_to_intercept(self, baggage_positions, possible_moves):
+        """Encuentra la mejor posición para interceptar bagajes enemigos."""
+        if not baggage_positions or not possible_moves:
+            return None
+
+        # Calcular la distancia de cada bagaje a Arsouf
+        baggage_to_arsouf = {}
+        for r, c in baggage_positions:
+            min_distance = self._arsouf_cost((r, c))
+            baggage_to_arsouf[(r, c)] = min_distance
+
+        # Ordenar bagajes por cercanía a Arsouf (más cercano primero)
+        sorted_baggage = sorted(baggage_positions, key=lambda pos: baggage_to_arsouf[pos])
+
+        # Priorizar interceptar los bagajes más cercanos a Arsouf
+        priority_baggage = sorted_baggage[:2]  # Los 2 más cercanos
+
+        # Encontrar posiciones que intercepten el camino entre los bagajes y Arsouf
+        best_move = None
+        best_score = float('-inf')
+
+        for move_r, move_c in possible_moves:
+            score = 0
+
+            for bag_r, bag_c in priority_baggage:
+                # Verificar si estamos en el camino entre el bagaje y Arsouf:
+                # pasar por aquí apenas alarga el camino más barato del bagaje
+                dist_bag_to_arsouf = baggage_to_arsouf[(bag_r, bag_c)]
+                dist_bag_to_move = self.grid.distance((bag_r, bag_c), (move_r, move_c))
+                dist_move_to_arsouf = self._arsouf_cost((move_r, move_c))
+
+                # Si estamos aproximadamente en el camino
+                if abs(dist_bag_to_arsouf - (dist_bag_to_move + dist_move_to_arsouf)) <= 2:
+                    # Mejor puntuación si estamos más cerca del bagaje
+                    score += 10 - dist_bag_to_move
+
+            if score > best_score:
+                best_score = score
+                best_move = (move_r, move_c)
+
+        # Si no encontramos una buena posición de intercepción, movernos hacia el bagaje más cercano
+        if best_move is None and priority_baggage:
+            best_move = self._find_position_near_positions(priority_baggage, possible_moves)
+
+        return best_move
+
+    def _find_position_to_attack_baggage(self, baggage_positions, possible_moves):
+        """Encuentra la mejor posición para atacar bagajes enemigos."""
+        if not baggage_positions or not possible_moves:
+            return None
+
+        # Calcular la distancia de cada movimiento a cada bagaje
+        move_scores = {}
+        for move_r, move_c in possible_moves:
+            # Inicializar puntuación
+            move_scores[(move_r, move_c)] = 0
+
+            for bag_r, bag_c in baggage_positions:
+                dist = self.grid.distance((move_r, move_c), (bag_r, bag_c))
+
+                # Puntuación más alta para posiciones adyacentes a bagajes
+                if dist <= 1:
+                    move_scores[(move_r, move_c)] += 10
+                # Puntuación decreciente con la distancia
+                else:
+                    move_scores[(move_r, move_c)] += max(0, 5 - dist)
+
+        # Ordenar por puntuación
+        sorted_moves = sorted(possible_moves, key=lambda move: move_scores[move], reverse=True)
+
+        # Devolver el mejor movimiento, o uno aleatorio entre los mejores
+        best_moves = sorted_moves[:max(1, len(sorted_moves) // 4)]
+        return self.rng.choice(best_moves)
+
+    def _prioritize_units_for_combat(self, all_ai_units):
+        """Prioriza las unidades para el combate según estrategias específicas."""
+        # Filtrar unidades que pueden atacar (salud completa)
+        combat_ready_units = [(r, c, u) for r, c, u in all_ai_units if u.health == 2]
+
+        # Si no hay unidades listas para combate, retornar lista vacía
+        if not combat_ready_units:
+            return []
+
+        # Ordenar unidades según prioridad estratégica para combate
+        if self.side == config.SIDE_CRUSADERS:
+            # Para Cruzados: priorizar unidades fuertes y proteger bagajes
+            # 1. Caballeros y unidades de élite
+            strong_units = [(r, c, u) for r, c, u in combat_ready_units
+                            if isinstance(u, Templario) or isinstance(u, Hospitalario) or isinstance(u, Caballero)]
+            # 2. Ricardo (si está en posición de atacar)
+            leaders = [(r, c, u) for r, c, u in combat_ready_units if isinstance(u, Ricardo)]
+            # 3. Infantería
+            infantry = [(r, c, u) for r, c, u in combat_ready_units if isinstance(u, Infanteria)]
+            # 4. Bagajes (normalmente no atacan, pero por si acaso)
+            baggage = [(r, c, u) for r, c, u in combat_ready_units if isinstance(u, Bagaje)]
+
+            # Ordenar por prioridad
+            return strong_units + leaders + infantry + baggage
+        else:  # SARRACENOS
+            # Para Sarracenos: priorizar atacar bagajes y unidades débiles
+            # 1. Mamelucos (unidades fuertes)
+            mamelucos = [(r, c, u) for r, c, u in combat_ready_units if isinstance(u, Mameluco)]
+            # 2. Arqueros
+            archers = [(r, c, u) for r, c, u in combat_ready_units if isinstance(u, Arquero)]
+            # 3. Exploradores
+            explorers = [(r, c, u) for r, c, u in combat_ready_units if isinstance(u, Explorador)]
+            # 4. Saladino (si está en posición de atacar)
+            leaders = [(r, c, u) for r, c, u in combat_ready_units if isinstance(u, Saladino)]
+
+            # Ordenar por prioridad
+            return mamelucos + archers + explorers + leaders
+
+    def select_combat_target(self, attacker, possible_targets):
+        """Selecciona el mejor objetivo para atacar según prioridades estratégicas."""
+        if not possible_targets:
+            return None
+
+        # Calcular puntuación para cada objetivo
+        target_scores = {}
+
+        for target in possible_targets:
+            score = self._target_score(target, target.health)
+
+            # Valor esperado del ataque según las probabilidades exactas del combate:
+            # lo que vale herir al objetivo menos lo que vale perder la propia herida
+            odds = combat_odds(attacker, target, self.grid)
+            target_scores[target] = score * odds.win - self._unit_value(attacker) * odds.lose
+
+        # Seleccionar el objetivo con mayor puntuación
+        if target_scores:
+            return max(target_scores.items(), key=lambda x: x[1])[0]
+        return self.rng.choice(possible_targets)  # Fallback a selección aleatoria
+
+    def _target_score(self, target, health):
+        """Valor de herir a target cuando tiene la salud indicada."""
+        # Prioridad base según tipo de unidad objetivo
+        score = self._unit_value(target)
+
+        # Bonus por unidades heridas (más fáciles de eliminar)
+        if health == 1:
+            score += 5
+
+        # Estrategias específicas según el bando
+        if self.side == config.SIDE_CRUSADERS:
+            # Priorizar unidades que amenazan a los bagajes
+            if isinstance(target, Explorador) or isinstance(target, Mameluco):
+                score += 3
+        else:  # SARRACENOS
+            # Priorizar bagajes y unidades que protegen el camino a Arsouf
+            if isinstance(target, Bagaje):
+                score += 5
+            elif isinstance(target, Infanteria) and self._is_unit_protecting_baggage(target):
+                score += 4
+        return score
+
+    def _unit_value(self, unit):
+        """Prioridad base de una unidad como objetivo según su tipo."""
+        if isinstance(unit, Bagaje):
+            return 10  # Máxima prioridad a los bagajes
+        elif isinstance(unit, Ricardo) or isinstance(unit, Saladino):
+            return 8   # Alta prioridad a los líderes
+        elif isinstance(unit, Templario) or isinstance(unit, Hospitalario):
+            return 7   # Alta prioridad a unidades de élite
+        elif isinstance(unit, Caballero) or isinstance(unit, Mameluco):
+            return 6   # Prioridad a unidades fuertes
+        elif isinstance(unit, Infanteria):
+            return 4   # Prioridad media a infantería
+        elif isinstance(unit, Arquero):
+            return 3   # Prioridad media-baja a arqueros
+        elif isinstance(unit, Explorador):
+            return 2   # Baja prioridad a exploradores
+        return 0
+
+    def _is_unit_protecting_baggage(self, unit):
+        """Determina si una unidad está protegiendo bagajes."""
+        # Buscar bagajes cercanos
+        for r, c, _baggage in self.grid.unit_positions(unit.side, Bagaje):
+            distance = self.grid.distance((unit.row, unit.col), (r, c))
+            if distance <= 2:  # Si está a 2 o menos hexágonos de distancia
+                return True
+        return False
@@ -0,0 +1,123 @@
+# aiworker.py
+"""
+Turno de la IA calculado fuera del bucle de dibujo.
+
+AITurnWorker juega el turno completo de un AIPlayer en un hilo, sobre una
+copia del GameState, y publica en una cola las acciones que aplica al motor
+(mover, atacar, terminar fase). El bucle principal de Game las saca de la cola
+sin esperar y las repite sobre la partida real a su ritmo, así que la ventana
+sigue dibujándose y respondiendo mientras la IA piensa.
+
+Cada acción guarda el estado del generador aleatorio justo antes de aplicarse
+en la copia. Al restaurarlo en la partida real antes de repetirla, los dados
+salen igual que en la copia y el resultado es el mismo que si la IA hubiera
+jugado directamente sobre la partida (la semilla sigue reproduciéndola).
+
+Se usa un hilo y no un proceso porque la IA necesita el AIPlayer (y su pool de
+procesos, en MCTSPlayer) entre turnos; la búsqueda de MCTSPlayer ya reparte
+las simulaciones entre procesos.
+"""
+import queue
+import threading
+from collections import namedtuple
+
+import gettext
+_ = gettext.gettext
+
+from rules import RulesEngine
+
+# Tipos de acción
+ACTION_MOVE = "MOVE"
+ACTION_ATTACK = "ATTACK"
+ACTION_END_PHASE = "END_PHASE"
+
+# Acción de la IA: tipo, origen, destino (None en END_PHASE) y estado del generador aleatorio
+AIAction = namedtuple("AIAction", ["kind", "from_pos", "to_pos", "rng_state"])
+
+
+class _Cancelled(Exception):
+    """Interrumpe el turno de la IA cuando se cierra el worker."""
+
+
+class _RecordingEngine(RulesEngine):
+    """RulesEngine que además publica en una cola cada acción que aplica."""
+    def __init__(self, state, actions, cancelled):
+        super().__init__(state)
+        self._actions = actions
+        self._cancelled = cancelled
+
+    def _record(self, kind, from_pos=None, to_pos=None):
+        if self._cancelled.is_set():
+            raise _Cancelled()
+        self._actions.put(AIAction(kind, from_pos, to_pos, self.state.rng.getstate()))
+
+    def move(self, from_pos, to_pos):
+        self._record(ACTION_MOVE, from_pos, to_pos)
+        return super().move(from_pos, to_pos)
+
+    def attack(self, attacker_pos, target_pos):
+        self._record(ACTION_ATTACK, attacker_pos, target_pos)
+        return super().attack(attacker_pos, target_pos)
+
+    def end_phase(self):
+        self._record(ACTION_END_PHASE)
+        return super().end_phase()
+
+
+class AITurnWorker:
+    """
+    Calcula en segundo plano el turno de una IA.
+
+    Parámetros:
+        player (AIPlayer): IA que juega el turno; mientras calcula, trabaja
+            sobre una copia del estado y no debe usarse desde otro hilo
+        engine (RulesEngine): Motor de la partida real, del que se copia el
+            estado y al que vuelve la IA al terminar
+    """
+    def __init__(self, player, engine):
+        self.player = player
+        self.engine = engine
+        self._actions = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """True mientras el hilo sigue calculando el turno."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Empieza a calcular el turno de la IA a partir del estado actual de la partida."""
+        if self.running:
+            raise RuntimeError(_("La IA ya está calculando un turno"))
+        engine = _RecordingEngine(self.engine.state.clone(), self._actions, self._cancelled)
+        self._thread = threading.Thread(target=self._play_turn, args=(engine,), daemon=True)
+        self._thread.start()
+
+    def _play_turn(self, engine):
+        self.player.use_engine(engine)
+        self.player.stop_event = self._cancelled
+        try:
+            self.player.play_turn()
+        except _Cancelled:
+            pass
+        finally:
+            self.player.stop_event = None
+            self.player.use_engine(self.engine)
+
+    def next_action(self):
+        """Siguiente AIAction calculada, o None si todavía no hay ninguna (no espera)."""
+        try:
+            return self._actions.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self):
+        """
+        Interrumpe el turno en curso y espera al hilo. Las búsquedas de la IA
+        terminan en el acto con lo que lleven calculado (ver
+        AIPlayer.should_stop) y la siguiente acción ya no se aplica.
+        """
+        self._cancelled.set()
+        if self._thread is not None:
+            self._thread.join()
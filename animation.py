@@ -0,0 +1,105 @@
+# animation.py
+"""
+Animaciones y pausas de la partida con interfaz, sin dependencias de pygame.
+
+Timeline reproduce pasos (Tween) uno detrás de otro y avanza con el tiempo
+transcurrido de cada fotograma (el que devuelve clock.tick), en lugar de
+detener el programa con pygame.time.delay. Mientras un paso está en curso el
+bucle principal sigue dibujando y atendiendo eventos.
+
+La escala de reproducción multiplica la duración de todos los pasos: 0 los
+termina al instante, 1 es la velocidad normal y valores mayores ralentizan la
+partida. Las partidas sin interfaz (selfplay.py) no usan Timeline y no tienen
+ninguna pausa.
+"""
+from collections import deque
+
+
+def path_position(points, progress):
+    """
+    Punto a lo largo de una línea quebrada: progress 0 es el primer punto y 1
+    el último, con el mismo tiempo para cada tramo (un hexágono por tramo).
+    """
+    if len(points) == 1 or progress >= 1:
+        return points[-1]
+    segment = progress * (len(points) - 1)
+    index = int(segment)
+    fraction = segment - index
+    (x0, y0), (x1, y1) = points[index], points[index + 1]
+    return x0 + (x1 - x0) * fraction, y0 + (y1 - y0) * fraction
+
+
+class Tween:
+    """
+    Paso de un Timeline.
+
+    Parámetros:
+        duration (float): Duración en ms a velocidad normal
+        on_update: Función llamada en cada fotograma con el progreso (de 0 a 1)
+        on_finish: Función llamada al terminar el paso
+    """
+    __slots__ = ("duration", "elapsed", "on_update", "on_finish")
+
+    def __init__(self, duration, on_update=None, on_finish=None):
+        self.duration = duration
+        self.elapsed = 0.0
+        self.on_update = on_update
+        self.on_finish = on_finish
+
+    @property
+    def progress(self):
+        return min(1.0, self.elapsed / self.duration) if self.duration > 0 else 1.0
+
+    def advance(self, dt):
+        """Avanza dt ms y devuelve el tiempo sobrante si el paso ha terminado (None si no)."""
+        self.elapsed += dt
+        if self.on_update:
+            self.on_update(self.progress)
+        if self.elapsed < self.duration:
+            return None
+        if self.on_finish:
+            self.on_finish()
+        return self.elapsed - self.duration
+
+
+class Timeline:
+    """
+    Secuencia de pasos que se reproducen uno detrás de otro.
+
+    Parámetros:
+        scale (float): Escala de reproducción (0 instantánea, 1 normal, >1 más lenta)
+    """
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self._steps = deque()
+
+    @property
+    def busy(self):
+        """True mientras quede algún paso por reproducir."""
+        return bool(self._steps)
+
+    def add(self, duration, on_update=None, on_finish=None):
+        """Añade un paso al final de la secuencia. Con escala 0 se reproduce entero en el acto."""
+        tween = Tween(duration * self.scale, on_update, on_finish)
+        self._steps.append(tween)
+        if self.scale == 0:
+            self.finish()
+        return tween
+
+    def wait(self, duration):
+        """Añade una pausa de duration ms (a velocidad normal)."""
+        return self.add(duration)
+
+    def update(self, dt):
+        """Avanza la secuencia dt ms; el tiempo sobrante de un paso pasa al siguiente."""
+        while self._steps and dt is not None:
+            dt = self._steps[0].advance(dt)
+            if dt is not None:
+                self._steps.popleft()
+
+    def finish(self):
+        """Termina en el acto todos los pasos pendientes."""
+        while self._steps:
+            tween = self._steps[0]
+            tween.advance(max(0.0, tween.duration - tween.elapsed))
+            self._steps.popleft()
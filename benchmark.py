@@ -0,0 +1,182 @@
+# benchmark.py
+"""
+Pruebas de rendimiento del motor de reglas, sin interfaz gráfica.
+
+Uso: python benchmark.py [--seed S] [--repeat N]
+
+Prepara un tablero desplegado por las IAs (determinista según la semilla) y
+mide las operaciones más costosas del motor y la IA comparándolas con su versión de
+referencia, comprobando antes que ambas devuelven lo mismo.
+"""
+import argparse
+import copy
+import time
+
+import config
+import gettext
+_ = gettext.gettext
+
+from ai import AIPlayer
+from rules import GameState, RulesEngine
+
+
+def build_board(seed):
+    """Devuelve un motor con las dos IAs ya desplegadas y la partida en curso."""
+    engine = RulesEngine(GameState(seed))
+    for side in (config.SIDE_CRUSADERS, config.SIDE_SARACENS):
+        AIPlayer(engine, side).deploy_all()
+    engine.start_play(config.SIDE_CRUSADERS)
+    return engine
+
+
+def legacy_possible_moves(grid, row, col, speed):
+    """
+    Búsqueda en anchura original de HexGrid.get_possible_moves(), copiando el
+    camino completo en cada nodo. Se conserva solo como referencia.
+    """
+    from collections import deque
+
+    possible_moves = []
+    unit = grid.grid[row][col]
+    if not unit:
+        return possible_moves
+
+    effective_speed = speed
+    if hasattr(unit, 'slow') and (row, col) in config.ROAD_HEXES:
+        effective_speed += 1
+
+    def neighbors(r, c, path):
+        result = []
+        for nr, nc in grid.get_adjacent_positions(r, c):
+            if (nr, nc) in config.FORBIDDEN_HEXES:
+                continue
+            neighbor_unit = grid.grid[nr][nc]
+            if neighbor_unit and neighbor_unit.side != unit.side:
+                continue
+            cost = 1
+            if frozenset({(r, c), (nr, nc)}) in config.RIVER_BARRIERS:
+                if config.FORD_HEX not in path and config.FORD_HEX != (r, c) and config.FORD_HEX != (nr, nc):
+                    continue
+                cost = 2
+            if hasattr(unit, 'slow') and (r, c) in config.ROAD_HEXES:
+                cost = 0.75 if (nr, nc) in config.ROAD_HEXES else 1.25
+            result.append(((nr, nc), cost))
+        return result
+
+    visited = {(row, col): 0.0}
+    queue = deque([(row, col, 0.0, [])])
+    while queue:
+        r, c, dist, path = queue.popleft()
+        if dist > 0 and grid.grid[r][c] is None:
+            possible_moves.append((r, c))
+        for (nr, nc), cost in neighbors(r, c, path):
+            new_dist = dist + cost
+            # Comprobación de visitados tal cual estaba (siempre verdadera)
+            if new_dist <= effective_speed and (nr, nc not in visited or new_dist < visited.get((nr, nc), float('inf'))):
+                visited[(nr, nc)] = new_dist
+                queue.append((nr, nc, new_dist, path + [(r, c)]))
+    return possible_moves
+
+
+def timed(func, calls, repeat):
+    """Ejecuta func(*args) para cada args de calls y devuelve el mejor tiempo por llamada (µs)."""
+    best = float('inf')
+    for _i in range(repeat):
+        start = time.perf_counter()
+        for args in calls:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / len(calls) * 1e6
+
+
+def report(name, reference_us, current_us):
+    print(_("{name}: referencia {ref:.1f} µs, actual {cur:.1f} µs (x{speedup:.1f})").format(
+        name=name, ref=reference_us, cur=current_us, speedup=reference_us / current_us))
+
+
+def bench_movement(engine, repeat):
+    """Movimientos posibles de todas las unidades del tablero."""
+    grid = engine.grid
+    calls = [(grid, r, c, grid.grid[r][c].speed)
+             for r in range(grid.rows) for c in range(grid.cols) if grid.grid[r][c]]
+
+    for args in calls:
+        if set(legacy_possible_moves(*args)) != set(args[0].get_possible_moves(*args[1:])):
+            raise AssertionError(_("Movimientos distintos para la unidad en ({row}, {col})").format(
+                row=args[1], col=args[2]))
+
+    reference = timed(legacy_possible_moves, calls, repeat)
+    current = timed(lambda g, r, c, s: g.get_possible_moves(r, c, s), calls, repeat)
+    report(_("Movimientos posibles"), reference, current)
+
+
+def bench_board_copy(engine, repeat):
+    """Copia del tablero: deepcopy de los objetos Unit frente a BoardState."""
+    grid = engine.grid
+    snapshot = grid.snapshot()
+    if grid.from_state(snapshot).snapshot() != snapshot:
+        raise AssertionError(_("El tablero reconstruido no coincide con el original"))
+
+    reference = timed(lambda: copy.deepcopy(grid.grid), [()] * 20, repeat)
+    current = timed(lambda: grid.snapshot().clone(), [()] * 20, repeat)
+    report(_("Copia del tablero"), reference, current)
+
+
+def bench_influence(engine, repeat):
+    """Enemigos a 2 hexágonos de cada casilla: una búsqueda por casilla frente al mapa de influencia."""
+    grid = engine.grid
+    side = config.SIDE_SARACENS
+    cells = [(r, c) for r in range(grid.rows) for c in range(grid.cols)]
+
+    def radius_counts():
+        return [len(grid.get_units_in_radius(r, c, 2, side)) for r, c in cells]
+
+    if radius_counts() != grid.influence_map(side, 2).count.tolist():
+        raise AssertionError(_("El mapa de influencia no coincide con get_units_in_radius"))
+
+    reference = timed(radius_counts, [()], repeat)
+    current = timed(lambda: grid.influence_map(side, 2).count.tolist(), [()], repeat)
+    report(_("Mapa de influencia"), reference, current)
+
+
+def check_threat(seeds):
+    """Comprueba que el mapa de amenaza marca los vecinos de los movimientos posibles de cada unidad."""
+    side = config.SIDE_SARACENS
+
+    def reference_threat(grid):
+        count = [0] * (grid.rows * grid.cols)
+        power = [0] * (grid.rows * grid.cols)
+        for (r, c), unit in grid.units_by_side[side].items():
+            if unit.health != 2:
+                continue
+            attackable = set()
+            for row, col in [(r, c)] + grid.get_possible_moves(r, c, unit.speed):
+                attackable.update(grid.get_adjacent_positions(row, col))
+            for row, col in attackable:
+                count[row * grid.cols + col] += 1
+                power[row * grid.cols + col] += unit.power
+        return count, power
+
+    for seed in seeds:
+        grid = build_board(seed).grid
+        threat = grid.threat_map(side)
+        if reference_threat(grid) != (threat.count.tolist(), threat.power.tolist()):
+            raise AssertionError(_("El mapa de amenaza no coincide con get_possible_moves (semilla {seed})").format(
+                seed=seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=_("Pruebas de rendimiento del motor de reglas"))
+    parser.add_argument("--seed", type=int, default=0, help=_("Semilla del tablero de prueba"))
+    parser.add_argument("--repeat", type=int, default=5, help=_("Repeticiones de cada medida"))
+    args = parser.parse_args()
+
+    engine = build_board(args.seed)
+    bench_movement(engine, args.repeat)
+    bench_board_copy(engine, args.repeat)
+    bench_influence(engine, args.repeat)
+    check_threat(range(args.seed, args.seed + 3))
+
+
+if __name__ == "__main__":
+    main()
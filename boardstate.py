@@ -0,0 +1,110 @@
+# boardstate.py
+"""
+Representación compacta del tablero.
+
+BoardState guarda cada hexágono en un byte (código del tipo de unidad y salud)
+y el hexágono de carga de cada unidad en un array paralelo, de modo que copiar,
+comparar o usar el tablero como clave de un diccionario cuesta O(casillas) sin
+copiar objetos Unit. HexGrid.snapshot() produce un BoardState y
+HexGrid.from_state() reconstruye un tablero jugable a partir de él.
+"""
+from array import array
+
+from units import *
+
+# Código de cada tipo de unidad (0 = casilla vacía)
+UNIT_CLASSES = (
+    Ricardo, Templario, Hospitalario, Caballero, Infanteria, Bagaje,
+    Saladino, Mameluco, Arquero, Explorador
+)
+UNIT_CODES = {unit_class: code for code, unit_class in enumerate(UNIT_CLASSES, start=1)}
+
+HEALTH_BITS = 2  # La salud (0-2) ocupa los dos bits bajos de cada celda
+HEALTH_MASK = (1 << HEALTH_BITS) - 1
+
+
+def encode_unit(unit):
+    """Codifica tipo y salud de una unidad en un byte."""
+    return UNIT_CODES[type(unit)] << HEALTH_BITS | unit.health
+
+
+def decode_unit(cell):
+    """Devuelve (clase, salud) de una celda codificada, o None si está vacía."""
+    if not cell:
+        return None
+    return UNIT_CLASSES[(cell >> HEALTH_BITS) - 1], cell & HEALTH_MASK
+
+
+class BoardState:
+    """
+    Tablero compacto: tipo y salud por hexágono más el hexágono de carga.
+
+    cells[row * cols + col] es el byte codificado de la unidad (0 si está vacía)
+    y charging[row * cols + col] el índice plano de su hexágono de carga más
+    uno (0 si no tiene). Es mutable; no se debe modificar mientras se use como
+    clave de un diccionario.
+    """
+    __slots__ = ("rows", "cols", "cells", "charging")
+
+    def __init__(self, rows, cols, cells=None, charging=None):
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells if cells is not None else bytearray(rows * cols)
+        self.charging = charging if charging is not None else array('H', bytes(2 * rows * cols))
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Codifica el contenido de un HexGrid."""
+        state = cls(grid.rows, grid.cols)
+        for row, col, unit in grid.unit_positions():
+            state.set_unit(row, col, type(unit), unit.health, unit.charging_hex)
+        return state
+
+    def clone(self):
+        """Copia independiente del tablero."""
+        return BoardState(self.rows, self.cols, bytearray(self.cells), array('H', self.charging))
+
+    def unit_at(self, row, col):
+        """Devuelve (clase, salud) de la unidad en (row, col), o None si está vacía."""
+        return decode_unit(self.cells[row * self.cols + col])
+
+    def set_unit(self, row, col, unit_class, health=2, charging_hex=None):
+        """Coloca una unidad de la clase indicada en (row, col)."""
+        index = row * self.cols + col
+        self.cells[index] = UNIT_CODES[unit_class] << HEALTH_BITS | health
+        self.charging[index] = charging_hex[0] * self.cols + charging_hex[1] + 1 if charging_hex else 0
+
+    def clear(self, row, col):
+        """Vacía el hexágono (row, col)."""
+        index = row * self.cols + col
+        self.cells[index] = 0
+        self.charging[index] = 0
+
+    def charging_hex(self, row, col):
+        """Devuelve el hexágono de carga de la unidad en (row, col), o None."""
+        target = self.charging[row * self.cols + col]
+        return divmod(target - 1, self.cols) if target else None
+
+    def units(self):
+        """Recorre las unidades como tuplas (row, col, clase, salud) en orden de filas."""
+        cols = self.cols
+        for index, cell in enumerate(self.cells):
+            if cell:
+                row, col = divmod(index, cols)
+                yield row, col, UNIT_CLASSES[(cell >> HEALTH_BITS) - 1], cell & HEALTH_MASK
+
+    def key(self):
+        """Clave inmutable del tablero (bytes), apta para diccionarios y conjuntos."""
+        return bytes(self.cells) + self.charging.tobytes()
+
+    def __eq__(self, other):
+        if not isinstance(other, BoardState):
+            return NotImplemented
+        return (self.rows, self.cols) == (other.rows, other.cols) and \
+            self.cells == other.cells and self.charging == other.charging
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"BoardState({sum(1 for cell in self.cells if cell)} unidades)"
@@ -0,0 +1,243 @@
+# combat.py
+"""
+Probabilidades exactas de combate.
+
+Un ataque enfrenta ataque + 1d6 contra defensa + 1d6 (ver Unit.attack), así
+que el resultado solo depende de la diferencia entre los modificadores de
+ambos bandos. Las 36 tiradas posibles se convolucionan una sola vez en una
+tabla de P(ganar)/P(empatar)/P(perder) por diferencia, y combat_odds() solo
+tiene que calcular los bonus (con la misma lógica que Unit.attack) y mirar
+la tabla, sin simular ningún dado.
+
+CombatPlanner usa esas probabilidades para planificar una fase de combate
+completa: qué unidades atacan, en qué orden y a quién.
+"""
+from collections import Counter, namedtuple
+
+import config
+
+DICE_FACES = 6
+
+# Probabilidades de un ataque: gana (el defensor sufre una herida), empata
+# (nadie sufre daño) o pierde (el atacante sufre una herida)
+CombatOdds = namedtuple("CombatOdds", ["win", "draw", "lose"])
+
+NO_ODDS = CombatOdds(0.0, 1.0, 0.0)  # Ataque imposible: nadie sufre daño
+
+
+def build_odds_table():
+    """
+    Convoluciona los dos dados y devuelve la tabla de probabilidades indexada
+    por la diferencia de modificadores (ataque - defensa) en medios puntos,
+    ya que el bonus de los aliados puede ser medio punto. Fuera de la tabla el
+    resultado ya está decidido.
+    """
+    outcomes = DICE_FACES * DICE_FACES
+    rolls = Counter(attack - defense for attack in range(1, DICE_FACES + 1)
+                    for defense in range(1, DICE_FACES + 1))
+    table = {}
+    for half_points in range(-2 * DICE_FACES, 2 * DICE_FACES + 1):
+        difference = half_points / 2
+        win = sum(count for roll, count in rolls.items() if roll + difference > 0)
+        lose = sum(count for roll, count in rolls.items() if roll + difference < 0)
+        table[half_points] = CombatOdds(win / outcomes, (outcomes - win - lose) / outcomes, lose / outcomes)
+    return table
+
+
+ODDS_TABLE = build_odds_table()
+MAX_HALF_POINTS = 2 * DICE_FACES
+
+
+def dice_odds(difference):
+    """Probabilidades de un ataque con la diferencia de modificadores dada (ataque - defensa)."""
+    half_points = round(difference * 2)
+    half_points = max(-MAX_HALF_POINTS, min(MAX_HALF_POINTS, half_points))
+    return ODDS_TABLE[half_points]
+
+
+def combat_odds(attacker, defender, grid, absent=()):
+    """
+    Probabilidades exactas de que attacker gane, empate o pierda contra
+    defender en la posición actual del tablero, incluyendo el bonus de
+    aliados y líder y la carga. Un atacante herido no puede atacar (NO_ODDS).
+    Las unidades de absent no cuentan para los bonus (bajas hipotéticas).
+    """
+    if attacker.health != 2:
+        return NO_ODDS
+    attack, defense = attacker.combat_modifiers(defender, grid, absent)
+    return dice_odds(attack - defense)
+
+
+class CombatPlanner:
+    """
+    Planifica la fase de combate de un bando maximizando el valor esperado.
+
+    Recorre órdenes de ataque y asignaciones de objetivos como un árbol de
+    esperanzas: cada ataque tiene tres resultados con probabilidad exacta
+    (combat_odds) y cambia la salud de las unidades implicadas, y las bajas
+    cambian los bonus de los ataques siguientes. Las posiciones repetidas
+    (salud de cada unidad más atacantes que ya han actuado) se memorizan y
+    las ramas que no pueden superar a la mejor encontrada se podan con una
+    cota optimista. Si se agota el presupuesto de posiciones, el resto del
+    árbol se evalúa de forma voraz (el mejor ataque inmediato), igual que si
+    stop() devuelve True. El presupuesto no depende del tiempo, así que el plan
+    es el mismo en cualquier máquina y la partida se repite con su semilla.
+
+    Parámetros:
+        attackers (list): Unidades que pueden atacar (sanas y sin haber atacado)
+        grid (HexGrid): Tablero de la partida (no se modifica)
+        gain: Función (objetivo, salud) -> valor de herir al objetivo con esa salud
+        loss: Función (atacante) -> valor que se pierde si el atacante resulta herido
+        max_nodes (int): Posiciones nuevas que se exploran como máximo por planificación
+        stop: Función sin argumentos que devuelve True para cortar la búsqueda
+            antes de agotar max_nodes (None: solo cuenta max_nodes)
+    """
+    def __init__(self, attackers, grid, gain, loss, max_nodes=config.AI_COMBAT_MAX_NODES, stop=None):
+        self.grid = grid
+        self.max_nodes = max_nodes
+        self.stop = stop
+        self.adjacent = {}
+        for attacker in attackers:
+            enemies = grid.get_adjacent_enemies(attacker.row, attacker.col, attacker.side)
+            if attacker.health == 2 and enemies:
+                self.adjacent[attacker] = enemies
+        self.attackers = list(self.adjacent)
+        self.targets = list(dict.fromkeys(t for enemies in self.adjacent.values() for t in enemies))
+        self.units = self.attackers + self.targets
+        self._index = {unit: i for i, unit in enumerate(self.units)}
+        self._gain = {(t, health): gain(t, health) for t in self.targets for health in (1, 2)}
+        self._loss = {a: loss(a) for a in self.attackers}
+        # Mejor ganancia posible de cada atacante, para la cota optimista
+        self._max_gain = {a: max(self._gain[(t, health)] for t in self.adjacent[a] for health in (1, 2))
+                          for a in self.attackers}
+        self._odds = {}
+        self._memo = {}
+        self._nodes = 0  # Posiciones exploradas en la planificación en curso
+
+    def current_state(self, attacked_positions):
+        """Estado actual: salud de cada unidad y máscara de atacantes que ya han actuado."""
+        healths = tuple(unit.health for unit in self.units)
+        acted = 0
+        for i, attacker in enumerate(self.attackers):
+            if (attacker.row, attacker.col) in attacked_positions:
+                acted |= 1 << i
+        return healths, acted
+
+    def plan(self, attacked_positions=()):
+        """
+        Devuelve el plan completo de la fase como lista de (atacante, objetivo):
+        la mejor secuencia de ataques suponiendo en cada paso el resultado más
+        probable. Los atacantes que no aparecen no deberían atacar.
+        """
+        healths, acted = self.current_state(attacked_positions)
+        self._nodes = 0
+        plan = []
+        while True:
+            action = self._search(healths, acted)[1]
+            if action is None:
+                return plan
+            i, j = action
+            plan.append((self.attackers[i], self.units[j]))
+            odds = self._odds_for(i, j, healths)
+            acted |= 1 << i
+            if odds.win >= max(odds.draw, odds.lose):
+                healths = self._wounded(healths, j)
+            elif odds.lose > odds.draw:
+                healths = self._wounded(healths, i)
+
+    def best_target(self, attacker, attacked_positions=()):
+        """
+        Mejor objetivo para attacker en el estado actual del tablero, o None
+        si el plan óptimo es que no ataque.
+        """
+        if attacker not in self.adjacent:
+            return None
+        healths, acted = self.current_state(attacked_positions)
+        i = self.attackers.index(attacker)
+        if acted >> i & 1:
+            return None
+        self._nodes = 0
+        best_value, best_target = self._value(healths, acted | 1 << i), None  # No atacar
+        for target in self.adjacent[attacker]:
+            j = self._index[target]
+            if healths[j] == 0:
+                continue
+            value = self._action_value(healths, acted, i, j)
+            if value > best_value:
+                best_value, best_target = value, target
+        return best_target
+
+    def _value(self, healths, acted):
+        return self._search(healths, acted)[0]
+
+    def _search(self, healths, acted):
+        """Devuelve (valor esperado, mejor acción (i, j) o None) desde un estado."""
+        key = (healths, acted)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        self._nodes += 1
+
+        # Ataques posibles, ordenados por valor inmediato para podar antes
+        candidates = []
+        for i, attacker in enumerate(self.attackers):
+            if acted >> i & 1 or healths[i] != 2:
+                continue
+            for target in self.adjacent[attacker]:
+                j = self._index[target]
+                if healths[j] == 0:
+                    continue
+                odds = self._odds_for(i, j, healths)
+                immediate = odds.win * self._gain[(target, healths[j])] - odds.lose * self._loss[attacker]
+                candidates.append((immediate, i, j, odds))
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        best_value, best_action = 0.0, None  # No atacar con nadie más
+        if candidates and (self._nodes > self.max_nodes or (self.stop is not None and self.stop())):
+            # Presupuesto agotado: decisión voraz
+            immediate, i, j, _odds = candidates[0]
+            if immediate > 0:
+                best_value, best_action = immediate, (i, j)
+        else:
+            # Cota optimista: cada atacante restante consigue su mejor herida seguro
+            bound = sum(self._max_gain[self.attackers[i]] for i in {candidate[1] for candidate in candidates})
+            for immediate, i, j, odds in candidates:
+                attacker = self.attackers[i]
+                rest = bound - self._max_gain[attacker]
+                if odds.win * self._gain[(self.units[j], healths[j])] + rest <= best_value:
+                    continue
+                value = self._action_value(healths, acted, i, j, odds)
+                if value > best_value:
+                    best_value, best_action = value, (i, j)
+
+        self._memo[key] = (best_value, best_action)
+        return best_value, best_action
+
+    def _action_value(self, healths, acted, i, j, odds=None):
+        """Valor esperado de que el atacante i ataque a la unidad j y se siga jugando de forma óptima."""
+        odds = odds or self._odds_for(i, j, healths)
+        acted |= 1 << i
+        value = 0.0
+        if odds.win:
+            value += odds.win * (self._gain[(self.units[j], healths[j])] + self._value(self._wounded(healths, j), acted))
+        if odds.draw:
+            value += odds.draw * self._value(healths, acted)
+        if odds.lose:
+            value += odds.lose * (self._value(self._wounded(healths, i), acted) - self._loss[self.attackers[i]])
+        return value
+
+    def _odds_for(self, i, j, healths):
+        """Probabilidades del ataque de i contra j con las bajas de ese estado."""
+        absent = frozenset(unit for unit, health in zip(self.units, healths) if health == 0)
+        key = (i, j, absent)
+        odds = self._odds.get(key)
+        if odds is None:
+            odds = combat_odds(self.attackers[i], self.units[j], self.grid, absent)
+            self._odds[key] = odds
+        return odds
+
+    @staticmethod
+    def _wounded(healths, index):
+        healths = list(healths)
+        healths[index] -= 1
+        return tuple(healths)
@@ -0,0 +1,73 @@
+# compositor.py
+"""
+Dibujo de la pantalla por capas con rectángulos sucios.
+
+Cada capa ocupa un rectángulo fijo de la pantalla y tiene una clave: un valor
+que resume todo lo que influye en su aspecto (posición del scroll, unidades,
+selección, mensajes...). En cada fotograma el Compositor solo redibuja las
+capas cuya clave ha cambiado y devuelve sus rectángulos para actualizarlos con
+pygame.display.update(). Si nada ha cambiado no se dibuja nada y la pantalla
+se queda como estaba.
+
+Al redibujar una capa se redibujan también, recortadas a su rectángulo, las
+capas que se solapan con ella (las de debajo para limpiar el fondo y las de
+encima para volver a cubrirlo), en su orden.
+"""
+
+_INVALID = object()  # Clave que no coincide con ninguna: obliga a redibujar la capa
+
+
+class Layer:
+    """
+    Capa de la pantalla.
+
+    Parámetros:
+        rect (pygame.Rect): Zona de la pantalla que ocupa la capa
+        key: Función sin argumentos que devuelve la clave actual de la capa
+        draw: Función sin argumentos que dibuja la capa en la pantalla
+    """
+    __slots__ = ("rect", "key", "draw", "last_key")
+
+    def __init__(self, rect, key, draw):
+        self.rect = rect
+        self.key = key
+        self.draw = draw
+        self.last_key = _INVALID
+
+
+class Compositor:
+    """Capas de la pantalla, de la de más abajo a la de más arriba."""
+    def __init__(self):
+        self.layers = []
+
+    def add_layer(self, rect, key, draw):
+        """Añade una capa encima de las existentes."""
+        layer = Layer(rect, key, draw)
+        self.layers.append(layer)
+        return layer
+
+    def invalidate(self):
+        """Obliga a redibujar todas las capas en el próximo render()."""
+        for layer in self.layers:
+            layer.last_key = _INVALID
+
+    def render(self, screen):
+        """Redibuja las capas que han cambiado y devuelve los rectángulos de pantalla a actualizar."""
+        dirty = []
+        for layer in self.layers:
+            key = layer.key()
+            if key != layer.last_key:
+                layer.last_key = key
+                dirty.append(layer.rect)
+        # Un rectángulo dentro de otro ya se redibuja con el mayor
+        dirty = [rect for i, rect in enumerate(dirty)
+                 if not any(other.contains(rect) and (other != rect or j < i) for j, other in enumerate(dirty) if j != i)]
+
+        for rect in dirty:
+            for layer in self.layers:
+                area = rect.clip(layer.rect)
+                if area.width and area.height:
+                    screen.set_clip(area)
+                    layer.draw()
+        screen.set_clip(None)
+        return dirty
@@ -78,8 +78,11 @@ MAP_HEIGHT = 1470
 
 # 1.1. Obtener resolución de pantalla (para calcular escalado)
 def get_screen_resolution():
-    user32 = ctypes.windll.user32
-    return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+    try:
+        user32 = ctypes.windll.user32
+        return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
+    except AttributeError:  # ctypes.windll solo existe en Windows
+        return 1920, 1080
 
 screen_w, screen_h = get_screen_resolution()
 
@@ -131,6 +134,9 @@ SCROLLBAR_WIDTH = 14
 SCROLLBAR_COLOR = (60, 60, 80)
 SCROLLBAR_HANDLE_COLOR = (130, 130, 160)
 
+# 5.3 Textos (fonts.py)
+TEXT_CACHE_SIZE = 512  # Textos rasterizados que se guardan en la caché LRU
+
 # 5. Grid hexagonal
 HEX_ROWS = 15
 HEX_COLS = 22
@@ -274,6 +280,20 @@ TURN_PHASES = {
 }
 
 MAX_TURNS = 35  # Número máximo de turnos por partida
+AI_COMBAT_MAX_NODES = 4000  # Posiciones que explora como máximo la IA al planificar cada fase de combate
+
+# IA con búsqueda MCTS (mcts.py)
+AI_MCTS_BUDGET_MS = 4000  # Tiempo máximo (ms) de búsqueda por turno, repartido entre sus decisiones
+AI_MCTS_ROLLOUTS = 2000  # Máximo de simulaciones por decisión
+AI_MCTS_ROLLOUT_TURNS = 2  # Turnos que se simulan (como máximo) tras cada decisión
+AI_MCTS_POLICY = "random"  # Política de las simulaciones: "random" (rápida) o "heuristic" (reglas de AIPlayer)
+
+# Animaciones y ritmo de la partida con interfaz (animation.py)
+PLAYBACK_SCALE = 1.0  # Escala de duración de animaciones y pausas: 0 instantánea, 1 normal, 2 lenta
+PLAYBACK_SCALES = (0, 0.5, 1.0, 2.0)  # Escalas que se recorren con la tecla V durante la partida
+ANIM_MOVE_STEP_MS = 120  # Duración (ms) del paso de una unidad de un hexágono al siguiente
+ANIM_MOVE_PAUSE_MS = 200  # Pausa (ms) tras cada movimiento de la IA
+ANIM_ATTACK_MS = 1000  # Duración (ms) del efecto de un ataque
 
 # ------------------------------
 # VALIDACIÓN DE CONFIG
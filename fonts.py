@@ -0,0 +1,39 @@
+# fonts.py
+"""
+Fuentes y textos de la interfaz, cacheados.
+
+pygame.font.SysFont busca la fuente en el sistema cada vez que se llama, y
+pygame.font.Font vuelve a leer el archivo TTF del disco. get_font() crea cada
+fuente una sola vez, y render_text() guarda los textos ya rasterizados en una
+caché LRU, de modo que los textos que no cambian de un fotograma a otro no se
+vuelven a dibujar letra a letra.
+
+Las superficies que devuelve render_text() son compartidas: se pueden copiar
+en pantalla con blit, pero no modificar.
+"""
+import os
+from functools import lru_cache
+
+import pygame
+
+import config
+
+
+@lru_cache(maxsize=None)
+def get_font(family, size, bold=False):
+    """
+    Fuente family (nombre de una fuente del sistema o ruta a un archivo
+    .ttf/.otf) de size puntos. Con una ruta, los errores de lectura del
+    archivo se propagan para que quien la pide pueda usar otra.
+    """
+    if os.path.splitext(family)[1].lower() in (".ttf", ".otf"):
+        font = pygame.font.Font(family, size)
+        font.set_bold(bold)
+        return font
+    return pygame.font.SysFont(family, size, bold=bold)
+
+
+@lru_cache(maxsize=config.TEXT_CACHE_SIZE)
+def render_text(text, font, color):
+    """Texto rasterizado (con antialiasing) con la fuente y el color indicados."""
+    return font.render(text, True, color)
@@ -1,15 +1,23 @@
 # gameui.py
+from collections import deque
+
 import pygame
 import gettext
 _ = gettext.gettext
 import config
+from compositor import Compositor
+from fonts import get_font, render_text
 
 class GameUI:
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.SysFont('Arial', 24)
-        self.log_font = pygame.font.SysFont('Arial', config.LOG_FONT_SIZE)
-        self.log_messages = []
+        self.font = get_font('Arial', 24)
+        self.log_font = get_font('Arial', config.LOG_FONT_SIZE)
+        self.log_messages = deque(maxlen=config.LOG_MAX_MESSAGES)
+        self._log_surfaces = deque(maxlen=config.LOG_MAX_MESSAGES)  # Texto de cada mensaje (None hasta que se ve)
+        self.log_count = 0  # Mensajes añadidos desde el principio (cambia aunque la lista esté llena)
+        self._log_panel = None  # Líneas visibles del log ya compuestas
+        self._log_panel_key = None
         self.log_scroll_position = 0
         self.log_scroll_dragging = False
         self.log_scroll_handle_rect = None
@@ -28,6 +36,11 @@ class GameUI:
         self.map_drag_start_scroll_x = 0
         self.map_drag_start_scroll_y = 0
 
+        # Capas de la pantalla durante la partida (ver _build_compositor)
+        self._board_layer = None  # Tablero visible con el scroll actual, sin transparencia
+        self._board_layer_key = None
+        self.compositor = self._build_compositor()
+
     def _get_visible_lines(self):
         line_height = config.LOG_LINE_HEIGHT
         panel_height = config.LOG_PANEL_HEIGHT - 2 * config.LOG_MARGIN
@@ -57,55 +70,73 @@ class GameUI:
         return pos_x, pos_y
 
     def draw_log_panel(self):
+        """
+        Dibuja el panel de log. Las líneas visibles se componen en una
+        superficie propia que solo se vuelve a dibujar al añadir mensajes o
+        mover el scroll; cada mensaje se rasteriza una sola vez.
+        """
         try:
             panel_rect = pygame.Rect(0, config.SCREEN_HEIGHT - config.LOG_PANEL_HEIGHT,
                                    config.LOG_PANEL_WIDTH, config.LOG_PANEL_HEIGHT)
-            pygame.draw.rect(self.game.screen, (30, 30, 40), panel_rect)
-            text_area = pygame.Rect(
-                panel_rect.x + config.LOG_MARGIN,
-                panel_rect.y + config.LOG_MARGIN,
-                panel_rect.width - 2*config.LOG_MARGIN - config.SCROLLBAR_WIDTH,
-                panel_rect.height - 2*config.LOG_MARGIN
-            )
             visible_lines = self._get_visible_lines()
             total_lines = len(self.log_messages)
             self.log_scroll_position = max(0, min(self.log_scroll_position, total_lines - visible_lines))
-            for i in range(visible_lines):
-                line_index = int(self.log_scroll_position) + i
-                if 0 <= line_index < len(self.log_messages):
-                    msg = self.log_messages[line_index]
-                    msg_text = self.log_font.render(msg, True, (220, 220, 220))
-                    self.game.screen.blit(msg_text,
-                                        (text_area.x,
-                                         text_area.y + i * config.LOG_LINE_HEIGHT))
-            if total_lines > visible_lines:
-                self._draw_log_scrollbar(panel_rect, total_lines, visible_lines)
+            key = (self.log_count, self.log_scroll_position, panel_rect.size)
+            if key != self._log_panel_key:
+                self._render_log_panel(panel_rect, total_lines, visible_lines)
+                self._log_panel_key = key
+            self.game.screen.blit(self._log_panel, panel_rect)
         except Exception as e:
             print(f"{_('ERROR dibujando panel LOG:')} {e}")
             raise
 
-    def _draw_log_scrollbar(self, panel_rect, total_lines, visible_lines):
+    def _render_log_panel(self, panel_rect, total_lines, visible_lines):
+        """Compone en self._log_panel las líneas visibles del log y su barra de scroll."""
+        if self._log_panel is None or self._log_panel.get_size() != panel_rect.size:
+            self._log_panel = pygame.Surface(panel_rect.size).convert()
+        surface = self._log_panel
+        surface.fill((30, 30, 40))
+        text_area = pygame.Rect(
+            config.LOG_MARGIN,
+            config.LOG_MARGIN,
+            panel_rect.width - 2*config.LOG_MARGIN - config.SCROLLBAR_WIDTH,
+            panel_rect.height - 2*config.LOG_MARGIN
+        )
+        first_line = int(self.log_scroll_position)
+        for i in range(min(visible_lines, total_lines - first_line)):
+            line_index = first_line + i
+            msg_text = self._log_surfaces[line_index]
+            if msg_text is None:
+                msg_text = self.log_font.render(self.log_messages[line_index], True, (220, 220, 220))
+                self._log_surfaces[line_index] = msg_text
+            surface.blit(msg_text, (text_area.x, text_area.y + i * config.LOG_LINE_HEIGHT))
+        if total_lines > visible_lines:
+            self._draw_log_scrollbar(surface, panel_rect, total_lines, visible_lines)
+
+    def _draw_log_scrollbar(self, surface, panel_rect, total_lines, visible_lines):
                     scrollbar_rect = pygame.Rect(
-                        panel_rect.right - config.SCROLLBAR_WIDTH - 5,
-                        panel_rect.y + 5,
+                        panel_rect.width - config.SCROLLBAR_WIDTH - 5,
+                        5,
                         config.SCROLLBAR_WIDTH,
                         panel_rect.height - 10
                     )
-                    pygame.draw.rect(self.game.screen, config.SCROLLBAR_COLOR, scrollbar_rect)
+                    pygame.draw.rect(surface, config.SCROLLBAR_COLOR, scrollbar_rect)
                     handle_height = max(40, (visible_lines / total_lines) * scrollbar_rect.height)
                     handle_y = scrollbar_rect.y + (self.log_scroll_position / max(1, total_lines - visible_lines)) * (scrollbar_rect.height - handle_height)
-                    self.log_scroll_handle_rect = pygame.Rect(
+                    handle_rect = pygame.Rect(
                         scrollbar_rect.x,
                         handle_y,
                         scrollbar_rect.width,
                         handle_height
                     )
-                    pygame.draw.rect(self.game.screen, config.SCROLLBAR_HANDLE_COLOR, self.log_scroll_handle_rect)
-                    pygame.draw.rect(self.game.screen, (200, 200, 230), self.log_scroll_handle_rect, 2)
+                    pygame.draw.rect(surface, config.SCROLLBAR_HANDLE_COLOR, handle_rect)
+                    pygame.draw.rect(surface, (200, 200, 230), handle_rect, 2)
+                    # Posición del asa en la pantalla, para arrastrarla con el ratón
+                    self.log_scroll_handle_rect = handle_rect.move(panel_rect.topleft)
                     if __debug__:
-                        debug_font = pygame.font.SysFont('Arial', 12)
-                        debug_text = debug_font.render(f"{int(self.log_scroll_position)}/{total_lines}", True, (255, 255, 255))
-                        self.game.screen.blit(debug_text, (scrollbar_rect.x - 30, scrollbar_rect.y))
+                        debug_font = get_font('Arial', 12)
+                        debug_text = render_text(f"{int(self.log_scroll_position)}/{total_lines}", debug_font, (255, 255, 255))
+                        surface.blit(debug_text, (scrollbar_rect.x - 30, scrollbar_rect.y))
 
     def handle_scroll_event(self, event):
         mouse_pos = pygame.mouse.get_pos()
@@ -167,9 +198,10 @@ class GameUI:
         self.log_scroll_position = max(0, min(self.log_scroll_position - scroll_delta, max_scroll))
 
     def add_log_message(self, message):
+        # Las colas descartan solas el mensaje más antiguo al llegar a LOG_MAX_MESSAGES
         self.log_messages.append(message)
-        if len(self.log_messages) > config.LOG_MAX_MESSAGES:
-            self.log_messages.pop(0)
+        self._log_surfaces.append(None)
+        self.log_count += 1
         visible_lines = self._get_visible_lines()
         total_lines = len(self.log_messages)
         max_scroll_position = max(0, total_lines - visible_lines)
@@ -413,15 +445,7 @@ class GameUI:
 
     def _get_hex_under_mouse(self, mouse_pos, grid):
         pos_x, pos_y = self._calculate_board_position(self.game.tablero_escalado)
-        for row in range(grid.rows):
-            for col in range(grid.cols):
-                x, y = grid.hex_to_pixel(row, col)
-                x += pos_x
-                y += pos_y
-                distance = ((mouse_pos[0] - x) ** 2 + (mouse_pos[1] - y) ** 2) ** 0.5
-                if distance < config.HEX_MIN_SIZE / 2:
-                    return row, col
-        return None
+        return grid.pixel_to_hex(mouse_pos[0] - pos_x, mouse_pos[1] - pos_y)
 
     def get_button_rect(self):
         if self.game.state == "PLAYER_TURN":
@@ -471,10 +495,10 @@ class GameUI:
         if hasattr(self.game, 'current_deploying_unit') and self.game.current_deploying_unit:
             unit_name = self.game.current_deploying_unit.image_key
             unit_info = f"{_('Despliega')}: {_(unit_name)}"
-            unit_text = self.font.render(unit_info, True, config.COLOR_TEXTO)
+            unit_text = render_text(unit_info, self.font, config.COLOR_TEXTO)
             if unit_text.get_width() > content_rect.width:
-                small_font = pygame.font.SysFont('Arial', 18)
-                unit_text = small_font.render(unit_info, True, config.COLOR_TEXTO)
+                small_font = get_font('Arial', 18)
+                unit_text = render_text(unit_info, small_font, config.COLOR_TEXTO)
             self.game.screen.blit(unit_text, (content_rect.x, y_offset))
             y_offset += 30
         selected_unit = self._get_selected_unit()
@@ -511,24 +535,24 @@ class GameUI:
     def _render_fitted_text(self, text, max_width, color=None, font_size=20):
         if color is None:
             color = config.COLOR_TEXTO
-        font = pygame.font.SysFont('Arial', font_size)
-        if font.size(text)[0] <= max_width:
-            return font.render(text, True, color)
-        small_font = pygame.font.SysFont('Arial', max(12, font_size - 6))
-        return small_font.render(text, True, color)
+        font = get_font('Arial', font_size)
+        text_surface = render_text(text, font, color)
+        if text_surface.get_width() <= max_width:
+            return text_surface
+        small_font = get_font('Arial', max(12, font_size - 6))
+        return render_text(text, small_font, color)
 
     def _draw_unit_info(self, unit, content_rect, y_offset):
         max_width = content_rect.width
         unit_name = unit.image_key
-        title_font = pygame.font.SysFont('Arial', 20, bold=True)
-        title_text = title_font.render(_(unit_name), True, config.COLOR_TEXTO)
+        title_font = get_font('Arial', 20, bold=True)
+        title_text = render_text(_(unit_name), title_font, config.COLOR_TEXTO)
         title_x = content_rect.x + (max_width - title_text.get_width()) // 2
         self.game.screen.blit(title_text, (title_x, y_offset))
         y_offset += 30
         if hasattr(unit, 'image_key') and unit.image_key in self.game.images:
-            img = self.game.images[unit.image_key]
             img_size = min(max_width, 250)
-            img_scaled = pygame.transform.smoothscale(img, (img_size, img_size))
+            img_scaled = self.game.sprites.get(unit.image_key, img_size)
             img_x = content_rect.x + (max_width - img_size) // 2
             self.game.screen.blit(img_scaled, (img_x, y_offset))
             y_offset += img_size + 10
@@ -556,7 +580,7 @@ class GameUI:
     def _draw_button(self, panel_rect, text, color, y_pos):
         button_rect = pygame.Rect(panel_rect.x + (config.PANEL_WIDTH - config.PANEL_BUTTON_WIDTH) // 2, y_pos, config.PANEL_BUTTON_WIDTH, config.PANEL_BUTTON_HEIGHT)
         pygame.draw.rect(self.game.screen, color, button_rect)
-        button_text = self.font.render(_(text), True, config.COLOR_TEXTO)
+        button_text = render_text(_(text), self.font, config.COLOR_TEXTO)
         self.game.screen.blit(button_text, (button_rect.centerx - button_text.get_width()//2,
                                          button_rect.centery - button_text.get_height()//2))
         return button_rect
@@ -624,6 +648,25 @@ class GameUI:
                 self.game.screen.blit(s, (x - config.HEX_MIN_SIZE//2, y - config.HEX_MIN_SIZE//2))
                 pygame.draw.circle(self.game.screen, (255, 0, 0), (x, y), config.HEX_MIN_SIZE//2 + 5, 3)
 
+    def draw_animations(self, game, offset_x=0, offset_y=0):
+        """Dibuja las unidades que se están moviendo y el efecto del ataque en curso."""
+        for unit, (x, y) in game.animated_units.items():
+            game.grid.draw_unit(game.screen, game.sprites, unit, int(x + offset_x), int(y + offset_y))
+        if game.attack_effect:
+            attacker_pos, target_pos, success, progress = game.attack_effect
+            ax, ay = game.grid.hex_to_pixel(*attacker_pos)
+            tx, ty = game.grid.hex_to_pixel(*target_pos)
+            ax, ay, tx, ty = ax + offset_x, ay + offset_y, tx + offset_x, ty + offset_y
+            # La línea del ataque avanza hasta el objetivo en el primer tercio del efecto
+            reach = min(1.0, progress * 3)
+            pygame.draw.line(game.screen, config.COMBAT_COLORS['attack'], (ax, ay),
+                             (ax + (tx - ax) * reach, ay + (ty - ay) * reach), 4)
+            if reach == 1.0:
+                # Después, un anillo que se expande sobre el objetivo: rojo si ha herido, azul si ha resistido
+                color = config.COMBAT_COLORS['wounded'] if success else config.COMBAT_COLORS['defense']
+                radius = int(config.HEX_MIN_SIZE // 2 * (0.5 + progress))
+                pygame.draw.circle(game.screen, color, (tx, ty), radius, 4)
+
     def draw_victory_progress(self, game):
         if game.state == "SELECT_SIDE" or game.state == "DEPLOY_PLAYER" or game.state == "DEPLOY_AI":
             return
@@ -634,15 +677,15 @@ class GameUI:
         s = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
         s.fill((0, 0, 0, 180))
         game.screen.blit(s, (panel_x, panel_y))
-        font_title = pygame.font.SysFont('Arial', 16, bold=True)
-        text_title = font_title.render(_("Progreso hacia Arsouf"), True, config.COLOR_TEXTO)
+        font_title = get_font('Arial', 16, bold=True)
+        text_title = render_text(_("Progreso hacia Arsouf"), font_title, config.COLOR_TEXTO)
         game.screen.blit(text_title, (panel_x + 10, panel_y + 10))
-        font = pygame.font.SysFont('Arial', 14)
-        text_turn = font.render(f"{_('Turno')}: {game.turn_count} / {game.max_turns}", True, config.COLOR_TEXTO)
+        font = get_font('Arial', 14)
+        text_turn = render_text(f"{_('Turno')}: {game.turn_count} / {game.max_turns}", font, config.COLOR_TEXTO)
         game.screen.blit(text_turn, (panel_x + 10, panel_y + 35))
-        text_bagaje = font.render(f"{_('Bagajes')}: {game.units_in_arsouf[config.BAGGAGE_NAME]}/2", True, config.COLOR_TEXTO)
+        text_bagaje = render_text(f"{_('Bagajes')}: {game.units_in_arsouf[config.BAGGAGE_NAME]}/2", font, config.COLOR_TEXTO)
         game.screen.blit(text_bagaje, (panel_x + 10, panel_y + 55))
-        text_other = font.render(f"{_('Otras unidades')}: {game.units_in_arsouf['other']}/2", True, config.COLOR_TEXTO)
+        text_other = render_text(f"{_('Otras unidades')}: {game.units_in_arsouf['other']}/2", font, config.COLOR_TEXTO)
         game.screen.blit(text_other, (panel_x + 10, panel_y + 75))
 
     def draw_intro(self, game):
@@ -652,12 +695,12 @@ class GameUI:
             else:
                 game.screen.blit(game.images["cover"], (0, 0))
             try:
-                intro_font = pygame.font.Font(config.FONT_PATHS["abbasy"], 120)
+                intro_font = get_font(config.FONT_PATHS["abbasy"], 120)
             except Exception as e:
                 print(f"Error loading font: {e}")
-                intro_font = pygame.font.SysFont('Arial', 80, bold=True)
+                intro_font = get_font('Arial', 80, bold=True)
             intro_text = config.GAME_NAME
-            intro_text_surface = intro_font.render(intro_text, True, config.WHITE)
+            intro_text_surface = render_text(intro_text, intro_font, config.WHITE)
             intro_text_rect = intro_text_surface.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT - 120))
             game.screen.blit(intro_text_surface, intro_text_rect)
             if hasattr(game, 'intro_start_time') and hasattr(game, 'intro_duration'):
@@ -677,69 +720,129 @@ class GameUI:
         s.fill((0, 0, 0, 220))
         game.screen.blit(s, (panel_x, panel_y))
         pygame.draw.rect(game.screen, (255, 215, 0), (panel_x, panel_y, panel_width, panel_height), 3)
-        font_title = pygame.font.SysFont('Arial', 30, bold=True)
-        text_title = font_title.render(_("FIN DEL JUEGO"), True, (255, 215, 0))
+        font_title = get_font('Arial', 30, bold=True)
+        text_title = render_text(_("FIN DEL JUEGO"), font_title, (255, 215, 0))
         game.screen.blit(text_title, (panel_x + (panel_width - text_title.get_width())//2, panel_y + 30))
-        font = pygame.font.SysFont('Arial', 20)
+        font = get_font('Arial', 20)
         if game.winner == config.SIDE_CRUSADERS:
-            text_winner = font.render(_("¡Victoria de los Cruzados!"), True, (255, 255, 255))
-            text_reason = font.render(_("Han llegado a Arsouf"), True, (255, 255, 255))
+            text_winner = render_text(_("¡Victoria de los Cruzados!"), font, (255, 255, 255))
+            text_reason = render_text(_("Han llegado a Arsouf"), font, (255, 255, 255))
         else:
-            text_winner = font.render(_("¡Victoria de los Sarracenos!"), True, (255, 255, 255))
-            text_reason = font.render(_("Los Cruzados no han llegado a Arsouf"), True, (255, 255, 255))
+            text_winner = render_text(_("¡Victoria de los Sarracenos!"), font, (255, 255, 255))
+            text_reason = render_text(_("Los Cruzados no han llegado a Arsouf"), font, (255, 255, 255))
         game.screen.blit(text_winner, (panel_x + (panel_width - text_winner.get_width())//2, panel_y + 80))
         game.screen.blit(text_reason, (panel_x + (panel_width - text_reason.get_width())//2, panel_y + 120))
-        font_exit = pygame.font.SysFont('Arial', 16)
-        text_exit = font_exit.render(_("Presiona ESC para salir"), True, (200, 200, 200))
+        font_exit = get_font('Arial', 16)
+        text_exit = render_text(_("Presiona ESC para salir"), font_exit, (200, 200, 200))
         game.screen.blit(text_exit, (panel_x + (panel_width - text_exit.get_width())//2, panel_y + 160))
 
+    def _build_compositor(self):
+        """
+        Capas de la partida, de abajo arriba: fondo, mapa (tablero, unidades,
+        resaltados y barras de scroll), panel de log, panel lateral, progreso
+        hacia Arsouf y fin del juego.
+        """
+        available_width = config.SCREEN_WIDTH - config.PANEL_WIDTH
+        available_height = config.SCREEN_HEIGHT - config.LOG_PANEL_HEIGHT
+        game_over_rect = pygame.Rect((config.SCREEN_WIDTH - 400) // 2, (config.SCREEN_HEIGHT - 200) // 2, 400, 200)
+
+        compositor = Compositor()
+        compositor.add_layer(self.game.screen.get_rect(), lambda: None,
+                             lambda: self.game.screen.fill(config.COLOR_BG))
+        compositor.add_layer(pygame.Rect(0, 0, available_width, available_height), self._map_key, self._draw_map)
+        compositor.add_layer(pygame.Rect(0, config.SCREEN_HEIGHT - config.LOG_PANEL_HEIGHT,
+                                         config.LOG_PANEL_WIDTH, config.LOG_PANEL_HEIGHT),
+                             lambda: (self.log_count, self.log_scroll_position), self.draw_log_panel)
+        compositor.add_layer(pygame.Rect(config.SCREEN_WIDTH - config.PANEL_WIDTH, 0,
+                                         config.PANEL_WIDTH, config.SCREEN_HEIGHT),
+                             self._panel_key, self.draw_panel)
+        compositor.add_layer(pygame.Rect(config.SCREEN_WIDTH - config.PANEL_WIDTH + 50, config.SCREEN_HEIGHT - 190, 200, 100),
+                             lambda: (self.game.state, self.game.turn_count, self.game.max_turns,
+                                      tuple(self.game.units_in_arsouf.values())),
+                             lambda: self.draw_victory_progress(self.game))
+        compositor.add_layer(game_over_rect, lambda: (self.game.game_over, self.game.winner),
+                             lambda: self.game.game_over and self.draw_game_over(self.game))
+        return compositor
+
+    def _map_key(self):
+        """Todo lo que se ve en el mapa: scroll, unidades, resaltados y animaciones."""
+        game = self.game
+        if game.tablero_escalado is None or game.grid is None:
+            return None
+        units = tuple((row, col, unit.image_key, unit.wounded_mark) for row, col, unit in game.grid.unit_positions())
+        animations = (tuple((id(unit), pos) for unit, pos in game.animated_units.items()), game.attack_effect)
+        highlights = (game.state, game.turn_phase, game.player_side, game.last_moved_unit_pos,
+                      game.selected_unit, tuple(game.possible_moves),
+                      id(game.combat_attacker), tuple((t.row, t.col) for t in game.combat_targets))
+        return (self._calculate_board_position(game.tablero_escalado), id(game.tablero_escalado),
+                game.sprites is not None, units, animations, highlights)
+
+    def _panel_key(self):
+        """Lo que muestra el panel lateral: estado, fase, unidad a desplegar y unidad seleccionada."""
+        game = self.game
+        deploying = game.current_deploying_unit
+        unit = self._get_selected_unit()
+        selected = unit and (unit.image_key, unit.side, unit.power, unit.speed, unit.original_speed,
+                             unit.leader, unit.health)
+        return (game.state, game.turn_phase, game.player_side, deploying and deploying.image_key, selected)
+
+    def _draw_board_layer(self, pos_x, pos_y, size):
+        """Tablero visible con el scroll (pos_x, pos_y), guardado sin transparencia para copiarlo deprisa."""
+        key = (pos_x, pos_y, size, id(self.game.tablero_escalado))
+        if key != self._board_layer_key:
+            self._board_layer = pygame.Surface(size).convert()
+            self._board_layer.fill(config.COLOR_BG)
+            self._board_layer.blit(self.game.tablero_escalado, (pos_x, pos_y))
+            if __debug__ and self.game.grid is not None:
+                self.game.grid.draw_hex_debug(self._board_layer, pos_x, pos_y)
+            self._board_layer_key = key
+        self.game.screen.blit(self._board_layer, (0, 0))
+
+    def _draw_map(self):
+        """Capa del mapa: tablero, última unidad movida, unidades, resaltados y barras de scroll."""
+        game = self.game
+        if game.tablero_escalado is None:
+            return
+        available_width = config.SCREEN_WIDTH - config.PANEL_WIDTH
+        available_height = config.SCREEN_HEIGHT - config.LOG_PANEL_HEIGHT
+        pos_x, pos_y = self._calculate_board_position(game.tablero_escalado)
+        self._draw_board_layer(pos_x, pos_y, (available_width, available_height))
+        if game.last_moved_unit_pos:
+            row, col = game.last_moved_unit_pos[0]
+            x, y = game.grid.hex_to_pixel(row, col)
+            x += pos_x
+            y += pos_y
+            s = pygame.Surface((config.HEX_MIN_SIZE, config.HEX_MIN_SIZE), pygame.SRCALPHA)
+            pygame.draw.circle(s, (255, 0, 0, 180), (config.HEX_MIN_SIZE//2, config.HEX_MIN_SIZE//2), config.HEX_MIN_SIZE//3)
+            game.screen.blit(s, (x - config.HEX_MIN_SIZE//2, y - config.HEX_MIN_SIZE//2))
+        if game.grid is not None and game.sprites is not None:
+            game.grid.draw(game.screen, game.sprites, pos_x, pos_y, hidden=game.animated_units)
+            self.draw_animations(game, pos_x, pos_y)
+        if game.selected_unit and game.possible_moves:
+            self.draw_possible_moves(game.possible_moves, game.grid, pos_x, pos_y)
+        if game.state == "PLAYER_TURN" and game.turn_phase == config.TURN_PHASES["COMBAT"]:
+            self.draw_combat_targets()
+        self.draw_deployment_zones()
+
+        # Draw map scrollbars
+        self._draw_map_scrollbars(game.tablero_escalado)
+
     def draw_game(self, game):
-        game.screen.fill(config.COLOR_BG)
-        if game.state == config.GAME_STATES["INTRO"]:
-            self.draw_intro(game)
-        elif game.state == config.GAME_STATES["SETUP_MENU"]:
-            self.draw_setup_menu()
-        elif game.state == config.GAME_STATES["SELECT_SIDE"]:
-            self.draw_side_selection()
-        else:
-            if game.tablero_escalado is not None:
-                # Create a clipping area for the map to prevent drawing outside bounds
-                available_width = config.SCREEN_WIDTH - config.PANEL_WIDTH
-                available_height = config.SCREEN_HEIGHT - config.LOG_PANEL_HEIGHT
-                map_clip_rect = pygame.Rect(0, 0, available_width, available_height)
-
-                # Set clipping area
-                game.screen.set_clip(map_clip_rect)
-
-                pos_x, pos_y = self._calculate_board_position(game.tablero_escalado)
-                game.screen.blit(game.tablero_escalado, (pos_x, pos_y))
-                if hasattr(game, 'last_moved_unit_pos') and game.last_moved_unit_pos:
-                    row, col = game.last_moved_unit_pos[0]
-                    x, y = game.grid.hex_to_pixel(row, col)
-                    x += pos_x
-                    y += pos_y
-                    s = pygame.Surface((config.HEX_MIN_SIZE, config.HEX_MIN_SIZE), pygame.SRCALPHA)
-                    pygame.draw.circle(s, (255, 0, 0, 180), (config.HEX_MIN_SIZE//2, config.HEX_MIN_SIZE//2), config.HEX_MIN_SIZE//3)
-                    game.screen.blit(s, (x - config.HEX_MIN_SIZE//2, y - config.HEX_MIN_SIZE//2))
-                if __debug__ and game.grid is not None:
-                    game.grid.draw_hex_debug(game.screen, pos_x, pos_y)
-                if game.grid is not None and game.images is not None:
-                    game.grid.draw(game.screen, game.images, pos_x, pos_y)
-                if game.selected_unit and game.possible_moves:
-                    self.draw_possible_moves(game.possible_moves, game.grid, pos_x, pos_y)
-                if game.state == "PLAYER_TURN" and game.turn_phase == config.TURN_PHASES["COMBAT"]:
-                    self.draw_combat_targets()
-                self.draw_deployment_zones()
-
-                # Remove clipping
-                game.screen.set_clip(None)
-
-                # Draw map scrollbars
-                self._draw_map_scrollbars(game.tablero_escalado)
-
-                #self.draw_victory_progress(game)
-            self.draw_log_panel()
-            self.draw_panel()
-            self.draw_victory_progress(game)
-        if game.game_over:
-            self.draw_game_over(game)
+        """
+        Dibuja el fotograma. Los menús y la introducción se dibujan enteros y
+        devuelven None (hay que actualizar toda la pantalla); la partida se
+        dibuja por capas y devuelve solo los rectángulos que han cambiado.
+        """
+        if game.state in (config.GAME_STATES["INTRO"], config.GAME_STATES["SETUP_MENU"],
+                          config.GAME_STATES["SELECT_SIDE"]):
+            # La pantalla se pinta entera: al volver a la partida hay que redibujar todas las capas
+            self.compositor.invalidate()
+            game.screen.fill(config.COLOR_BG)
+            if game.state == config.GAME_STATES["INTRO"]:
+                self.draw_intro(game)
+            elif game.state == config.GAME_STATES["SETUP_MENU"]:
+                self.draw_setup_menu()
+            else:
+                self.draw_side_selection()
+            return None
+        return self.compositor.render(game.screen)
@@ -1,22 +1,296 @@
 # hexgrid.py
-from collections import deque
+from collections import deque, namedtuple
+from functools import lru_cache
 
-import pygame
+import heapq
 import math
+import random
+
+import numpy as np
 import config
 import gettext
 _ = gettext.gettext
 
-from typing import List, Tuple, Optional  # Añadir estas importaciones
+from typing import Optional
 from units import *
+from boardstate import BoardState, encode_unit
+
+# pygame solo se importa en los métodos de dibujo, de modo que el motor de reglas
+# (rules.py) puede usar el grid sin inicializar ninguna interfaz gráfica.
+
+# Direcciones para hex grid vertical (vértices arriba/abajo)
+# Estructura: (dr, dc) donde dr = cambio en fila, dc = cambio en columna
+HEX_DIRECTIONS = (
+    ((-1, 0), (-1, 1), (0, 1), (1, 0), (1, 1), (0, -1)),  # Filas pares (indentadas)
+    ((-1, -1), (-1, 0), (0, 1), (1, -1), (1, 0), (0, -1))  # Filas impares
+)
+
+
+@lru_cache(maxsize=None)
+def build_neighbor_tables(rows, cols):
+    """
+    Precalcula los vecinos dentro del tablero de cada hexágono.
+
+    Devuelve dos tuplas indexadas por row * cols + col: la primera con las
+    posiciones (row, col) de los vecinos y la segunda con sus índices planos.
+    Las tablas son inmutables y se comparten entre todos los grids del mismo tamaño.
+    """
+    positions = []
+    indices = []
+    for row in range(rows):
+        for col in range(cols):
+            adjacent = tuple((row + dr, col + dc) for dr, dc in HEX_DIRECTIONS[row % 2]
+                             if 0 <= row + dr < rows and 0 <= col + dc < cols)
+            positions.append(adjacent)
+            indices.append(tuple(r * cols + c for r, c in adjacent))
+    return tuple(positions), tuple(indices)
+
+
+@lru_cache(maxsize=None)
+def build_distance_table(rows, cols):
+    """
+    Precalcula la distancia hexagonal entre todos los pares de hexágonos.
+
+    Convierte las coordenadas offset (filas pares indentadas) a coordenadas
+    cúbicas y devuelve (matriz, lista): una matriz NumPy de solo lectura de
+    (rows * cols) x (rows * cols) indexada por índices planos, para puntuar
+    muchos movimientos a la vez, y la misma tabla aplanada como lista de
+    enteros de Python, para consultas sueltas sin coste de NumPy.
+    """
+    index = np.arange(rows * cols)
+    row = index // cols
+    q = index % cols - (row + (row & 1)) // 2
+    dq = q[:, None] - q[None, :]
+    dr = row[:, None] - row[None, :]
+    distances = ((np.abs(dq) + np.abs(dr) + np.abs(dq + dr)) // 2).astype(np.int16)
+    distances.setflags(write=False)
+    return distances, distances.ravel().tolist()
+
+
+@lru_cache(maxsize=None)
+def build_radius_mask(rows, cols, radius):
+    """
+    Máscara de radio como matriz NumPy de (rows * cols) x (rows * cols):
+    mask[i][j] vale 1 si el hexágono j está a radius hexágonos o menos de i,
+    sin contar el propio hexágono (igual que get_units_in_radius).
+    Multiplicar un vector de ocupación por ella suma las unidades en el radio.
+    """
+    distances, _distance_list = build_distance_table(rows, cols)
+    mask = ((distances > 0) & (distances <= radius)).astype(np.int16)
+    mask.setflags(write=False)
+    return mask
+
+
+# Influencia de un bando sobre cada hexágono (arrays indexados por row * cols + col):
+# unidades a distancia <= radio, suma de su poder y distancia a su líder
+InfluenceMap = namedtuple("InfluenceMap", ["count", "power", "leader_distance"])
+
+# Amenaza de un bando para el turno siguiente (arrays indexados por row * cols + col):
+# unidades que podrían atacar cada hexágono y la suma de su poder
+ThreatMap = namedtuple("ThreatMap", ["count", "power"])
+
+
+ZOBRIST_SEED = 0x4172736F7566  # Fija: el mismo tablero da el mismo hash en todos los procesos
+ZOBRIST_CELL_CODES = 64  # Códigos de celda posibles (tipo de unidad y salud, ver boardstate.py)
+ZOBRIST_MAX_ARSOUF = 16  # Valores distintos de cada contador de Arsouf
+
+
+@lru_cache(maxsize=None)
+def build_zobrist_tables(rows, cols):
+    """
+    Genera las claves aleatorias de 64 bits del hash Zobrist de un tablero.
+
+    Devuelve (pieces, sides, phases, arsouf): pieces[índice][código] para cada
+    hexágono y código de celda, una clave por bando que mueve, una por fase y
+    arsouf[contador][valor] para los bagajes (0) y otras unidades (1) en Arsouf.
+    """
+    rng = random.Random(ZOBRIST_SEED)
+    pieces = tuple(tuple(rng.getrandbits(64) for _code in range(ZOBRIST_CELL_CODES))
+                   for _index in range(rows * cols))
+    sides = (rng.getrandbits(64), rng.getrandbits(64))
+    phases = (rng.getrandbits(64), rng.getrandbits(64))
+    arsouf = tuple(tuple(rng.getrandbits(64) for _value in range(ZOBRIST_MAX_ARSOUF)) for _counter in range(2))
+    return pieces, sides, phases, arsouf
+
+
+# Los costes de movimiento se cuentan en cuartos de punto para trabajar con enteros
+MOVE_COST_SCALE = 4
+
+# Clases de movimiento: las unidades a pie (slow) dependen de la carretera
+MOVE_CLASS_MOUNTED = 0
+MOVE_CLASS_FOOT = 1
+
+
+def movement_class(unit):
+    """Devuelve la clase de movimiento de una unidad."""
+    return MOVE_CLASS_FOOT if hasattr(unit, 'slow') else MOVE_CLASS_MOUNTED
+
+
+@lru_cache(maxsize=None)
+def build_terrain_edges(rows, cols):
+    """
+    Compila el terreno estático (prohibidos, río, vado y carretera) en una
+    tabla de aristas dirigidas por cada clase de movimiento.
+
+    edges[clase][índice] es una tupla de (índice_vecino, fila, columna, coste,
+    bloqueada_sin_vado) con el coste en cuartos de punto. Las casillas
+    prohibidas no aparecen como destino. Una arista bloqueada_sin_vado cruza el
+    río y solo se puede usar si el camino ya ha pasado por config.FORD_HEX.
+    """
+    positions, indices = build_neighbor_tables(rows, cols)
+    edges = ([], [])
+    for index, (adjacent, adjacent_indices) in enumerate(zip(positions, indices)):
+        pos = divmod(index, cols)
+        on_road_start = pos in config.ROAD_HEXES
+        mounted, foot = [], []
+        for (nr, nc), neighbor in zip(adjacent, adjacent_indices):
+            if (nr, nc) in config.FORBIDDEN_HEXES:
+                continue
+            cost = 4  # Costo base (1 punto)
+            gated = False
+            if frozenset({pos, (nr, nc)}) in config.RIVER_BARRIERS:
+                cost = 8  # Penalización por cruzar río
+                gated = config.FORD_HEX != (nr, nc)
+            mounted.append((neighbor, nr, nc, cost, gated))
+
+            # Unidades a pie: más rápido en carretera continua (0.75), más lento al dejarla (1.25)
+            if on_road_start:
+                cost = 3 if (nr, nc) in config.ROAD_HEXES else 5
+            foot.append((neighbor, nr, nc, cost, gated))
+        edges[MOVE_CLASS_MOUNTED].append(tuple(mounted))
+        edges[MOVE_CLASS_FOOT].append(tuple(foot))
+    return tuple(edges[MOVE_CLASS_MOUNTED]), tuple(edges[MOVE_CLASS_FOOT])
+
+
+@lru_cache(maxsize=None)
+def build_reverse_terrain_edges(rows, cols):
+    """
+    Invierte la tabla de build_terrain_edges(): reverse[clase][índice] es una
+    tupla de (índice_origen, coste, bloqueada_sin_vado) con cada arista que
+    llega a ese hexágono. Sirve para buscar hacia atrás desde un destino.
+    """
+    edges = build_terrain_edges(rows, cols)
+    reverse = []
+    for class_edges in edges:
+        incoming = [[] for _index in range(rows * cols)]
+        for index, outgoing in enumerate(class_edges):
+            for neighbor, _nr, _nc, cost, gated in outgoing:
+                incoming[neighbor].append((index, cost, gated))
+        reverse.append(tuple(tuple(entries) for entries in incoming))
+    return tuple(reverse)
+
+
+def compute_distance_field(rows, cols, targets, move_class, blocked=(), ford_crossed=False):
+    """
+    Dijkstra inverso desde los hexágonos targets con el terreno compilado.
+
+    Devuelve una lista indexada por row * cols + col con el coste mínimo en
+    puntos de movimiento para llegar desde cada hexágono a cualquiera de los
+    destinos (math.inf si no hay camino). Los hexágonos de blocked (índices
+    planos) no se pueden atravesar, como las unidades enemigas en
+    get_reachable(). El estado de la búsqueda es (hexágono, falta_vado): una
+    arista de río solo se puede usar si el camino pasa antes por el vado, salvo
+    con ford_crossed (costes para quien ya ha pasado por el vado).
+    """
+    reverse = build_reverse_terrain_edges(rows, cols)[move_class]
+    ford = config.FORD_HEX[0] * cols + config.FORD_HEX[1]
+    blocked = set(blocked)
+    # Coste mínimo por estado: best[falta_vado][índice]
+    best = ([math.inf] * (rows * cols), [math.inf] * (rows * cols))
+    queue = []
+    for row, col in targets:
+        index = row * cols + col
+        if index in blocked:
+            continue
+        best[False][index] = 0
+        queue.append((0, index, False))
+    heapq.heapify(queue)
+
+    while queue:
+        dist, index, needs_ford = heapq.heappop(queue)
+        if dist > best[needs_ford][index]:
+            continue  # Entrada obsoleta
+        for source, cost, gated in reverse[index]:
+            if source in blocked:
+                continue
+            needs = (needs_ford or (gated and not ford_crossed)) and source != ford
+            new_dist = dist + cost
+            if new_dist < best[needs][source]:
+                best[needs][source] = new_dist
+                heapq.heappush(queue, (new_dist, source, needs))
+    return [cost / MOVE_COST_SCALE for cost in best[False]]
+
+
+@lru_cache(maxsize=None)
+def build_distance_field(rows, cols, targets, move_class, ford_crossed=False):
+    """Campo de distancias de compute_distance_field() sobre el tablero vacío (solo terreno)."""
+    return tuple(compute_distance_field(rows, cols, targets, move_class, ford_crossed=ford_crossed))
+
+
+class MoveReach:
+    """
+    Resultado de HexGrid.get_reachable(): coste mínimo de cada hexágono
+    alcanzable y el camino más barato hasta él.
+    """
+
+    def __init__(self, origin, cols, best, previous):
+        self.origin = origin
+        self._cols = cols
+        self._previous = previous
+        # Mejor estado (índice, vado) de cada casilla
+        self._states = {}
+        for state, dist in best.items():
+            pos = divmod(state[0], cols)
+            if pos not in self._states or dist < best[self._states[pos]]:
+                self._states[pos] = state
+        # Coste mínimo en puntos de movimiento, en orden de coste creciente
+        self.costs = {pos: best[state] / MOVE_COST_SCALE
+                      for pos, state in sorted(self._states.items(), key=lambda item: best[item[1]])}
+
+    def path_to(self, pos):
+        """Devuelve el camino más barato [origen, ..., pos], o None si pos no es alcanzable."""
+        state = self._states.get(pos)
+        if state is None:
+            return None
+        path = []
+        while state is not None:
+            path.append(divmod(state[0], self._cols))
+            state = self._previous[state]
+        path.reverse()
+        return path
+
 
 class HexGrid:
-    def __init__(self) -> None:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
         self.rows = config.HEX_ROWS
         self.cols = config.HEX_COLS
 
+        # Generador aleatorio de la partida (dados de combate)
+        self.rng = rng if rng is not None else random.Random()
+
         self.grid = [[None for _ in range(config.HEX_COLS)] for _ in range(config.HEX_ROWS)]
 
+        # Índices de posiciones por bando y por tipo de unidad: {(row, col): unit}
+        # Se mantienen en add_unit/move_unit/remove_unit para no recorrer todo el tablero.
+        self.units_by_side = {SIDE_CRUSADERS: {}, SIDE_SARACENS: {}}
+        self.units_by_type = {}
+
+        # Hash Zobrist de las unidades del tablero, actualizado en cada cambio
+        self.zobrist_pieces, self.zobrist_sides, self.zobrist_phases, self.zobrist_arsouf = \
+            build_zobrist_tables(self.rows, self.cols)
+        self.zobrist = 0
+
+        # Tablas de vecinos precalculadas (índice plano: row * cols + col)
+        self.adjacent, self.neighbor_indices = build_neighbor_tables(self.rows, self.cols)
+        # Terreno compilado: aristas dirigidas con su coste por clase de movimiento
+        self.terrain_edges = build_terrain_edges(self.rows, self.cols)
+        # Distancias hexagonales entre todos los pares de hexágonos (por índice plano)
+        self.distances, self._distance_list = build_distance_table(self.rows, self.cols)
+        # Campos de distancia con ocupación: {(destinos, clase, bando): (enemigos, campo)}
+        self._distance_fields = {}
+        # Caminos de find_path(): {bando: (enemigos, {(origen, destinos, clase): camino})}
+        self._paths = {}
+
         # Geometría hexagonal (usando dimensiones reales)
         self.hex_width = config.HEX_WIDTH   # Ancho del hexágono (104px escalado)
         self.hex_height = config.HEX_HEIGHT  # Altura del hexágono (120px escalado)
@@ -45,6 +319,39 @@ class HexGrid:
 
         return int(x + self.offset_x), int(y + self.offset_y)
 
+    def pixel_to_hex(self, x, y) -> Optional[tuple[int, int]]:
+        """
+        Inversa de hex_to_pixel: hexágono que contiene el punto (x, y) del
+        tablero, o None si cae fuera del grid. Cualquier punto del grid
+        pertenece a algún hexágono (no hay huecos entre ellos).
+
+        Se escala el punto a un hexágono regular de radio 1 (centros separados
+        sqrt(3) en horizontal y 1.5 en vertical), se pasa a coordenadas axiales
+        fraccionarias y se redondea en coordenadas cúbicas.
+        """
+        # Las filas pares están indentadas: se resta medio hexágono para que
+        # la fila 0 empiece en x = 0, como en las coordenadas axiales
+        px = ((x - self.offset_x) / self.hex_width - 0.5) * math.sqrt(3)
+        py = (y - self.offset_y) / (self.hex_height * self.vertical_overlap_factor) * 1.5
+
+        # Coordenadas axiales fraccionarias (q, r) y cúbicas (q, r, s)
+        q = px / math.sqrt(3) - py / 3
+        r = py * 2 / 3
+        s = -q - r
+        rq, rr, rs = round(q), round(r), round(s)
+        dq, dr, ds = abs(rq - q), abs(rr - r), abs(rs - s)
+        if dq > dr and dq > ds:
+            rq = -rr - rs
+        elif dr > ds:
+            rr = -rq - rs
+
+        # Axiales -> fila y columna (filas pares indentadas)
+        row = rr
+        col = rq + (rr + (rr & 1)) // 2
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
     def add_unit(self, row: int, col: int, unit: Unit) -> None:
         """
         Añade una unidad al grid hexagonal y actualiza su posición.
@@ -64,104 +371,78 @@ class HexGrid:
         # 2. Verificar si la posición está ocupada
         if self.grid[row][col] is not None:
             print(_("¡Advertencia: Sobreescribiendo unidad en ({row}, {col})!").format(row=row, col=col))
+            self._unindex_unit(row, col, self.grid[row][col])
 
         # 3. Asignar unidad al grid
         self.grid[row][col] = unit
+        self.units_by_side.setdefault(unit.side, {})[(row, col)] = unit
+        self.units_by_type.setdefault(type(unit), {})[(row, col)] = unit
+        self.zobrist ^= self.zobrist_pieces[row * self.cols + col][encode_unit(unit)]
 
         # 4. Actualizar posición interna de la unidad
         unit.set_position(row, col)
 
     def get_possible_moves(self, row, col, speed, moved_units=None, current_path=None):
-        """Calcula todos los movimientos posibles desde una posición dada."""
-        if moved_units is None:
-            moved_units = set()
-        if current_path is None:
-            current_path = []
+        """
+        Calcula todos los movimientos posibles desde una posición dada.
+        Devuelve las casillas libres alcanzables, ordenadas por coste creciente.
+        """
+        reach = self.get_reachable(row, col, speed, moved_units, current_path)
+        if reach is None:
+            return []
+        return [pos for pos in reach.costs if pos != reach.origin and self.grid[pos[0]][pos[1]] is None]
 
-        possible_moves: List[Tuple[int, int]] = []
+    def get_reachable(self, row, col, speed, moved_units=None, current_path=None):
+        """
+        Calcula con Dijkstra los hexágonos alcanzables por la unidad en (row, col).
+
+        Recorre la tabla de aristas compilada del terreno (build_terrain_edges).
+        Los costes se acumulan en cuartos de punto de movimiento (enteros) y el
+        único estado que se arrastra además de la casilla es si el camino ya ha
+        pasado por el vado, que es lo único que deciden las barreras de río.
+        Incluye las casillas con aliados (se pueden atravesar, no ocupar).
+        Devuelve un MoveReach, o None si no hay unidad o ya ha movido.
+        """
         unit = self.grid[row][col]
-
-        if not unit or (row, col) in moved_units:
-            return possible_moves
+        if not unit or (moved_units and (row, col) in moved_units):
+            return None
 
         # Ajusta velocidad de unidades a pie (slow) en carretera
         effective_speed = speed
         if hasattr(unit, 'slow') and (row, col) in config.ROAD_HEXES:
             effective_speed += 1  # Bonus por empezar en carretera
-
-        from collections import deque
-        visited = {}
-        queue = deque()
-        queue.append((row, col, 0.0, current_path.copy())) # (row, col, accumulated_cost, path)
-        visited[(row, col)] = 0.0
+        budget = int(effective_speed * MOVE_COST_SCALE)
+
+        crossed = config.FORD_HEX == (row, col) or bool(current_path and config.FORD_HEX in current_path)
+        ford = config.FORD_HEX[0] * self.cols + config.FORD_HEX[1]
+        edges = self.terrain_edges[movement_class(unit)]
+        grid = self.grid
+        side = unit.side
+        start = (row * self.cols + col, crossed)
+        best = {start: 0}      # (índice, vado) -> coste mínimo
+        previous = {start: None}
+        queue = [(0,) + start]
 
         while queue:
-            r, c, dist, path = queue.popleft()
+            dist, index, crossed = heapq.heappop(queue)
+            if dist > best[(index, crossed)]:
+                continue  # Entrada obsoleta: ya se llegó más barato
 
-            if dist > 0 and self.grid[r][c] is None:
-                possible_moves.append((r, c))
-
-            for (nr, nc), cost in self._get_valid_neighbors(r, c, path, unit):
+            for neighbor, nr, nc, cost, gated in edges[index]:
                 new_dist = dist + cost
-                if new_dist <= effective_speed and (nr, nc not in visited or new_dist < visited.get((nr, nc), float('inf'))):
-                    visited[(nr, nc)] = new_dist
-                    queue.append((nr, nc, new_dist, path + [(r, c)]))
-
-        return possible_moves
-
-    def _get_valid_neighbors(self, row, col, current_path, unit):
-        """Devuelve vecinos válidos y costo de movimiento, considerando barreras"""
-        # Direcciones para hex grid vertical (vértices arriba/abajo)
-        # Estructura: (dr, dc) donde dr = cambio en fila, dc = cambio en columna
-        directions = [
-            [(-1,0), (-1,1), (0,1), (1,0), (1,1), (0,-1)],  # Filas pares (indentadas)
-            [(-1,-1), (-1,0), (0,1), (1,-1), (1,0), (0,-1)]  # Filas impares
-        ]
-
-        neighbors = []
-        dir_set = directions[row % 2]
-
-        for dr, dc in dir_set:
-            nr = row + dr
-            nc = col + dc
-
-            # 1. Verificar límites y hexágonos prohibidos
-            if not (0 <= nr < self.rows and 0 <= nc < self.cols):
-                continue
-            if (nr, nc) in config.FORBIDDEN_HEXES:
-                continue
-
-            # Verificar si hay una unidad enemiga en la casilla (no se puede saltar sobre enemigos)
-            neighbor_unit = self.grid[nr][nc]
-            if neighbor_unit and neighbor_unit.side != unit.side:
-                continue  # No se puede mover a través de unidades enemigas
-
-            # 2. Determinar costo base del movimiento
-            move_pair = frozenset({(row, col), (nr, nc)})
-            cost = 1  # Costo base
-
-            # 3. Aplicar modificadores de terreno
-            # a) Barreras de río
-            if move_pair in config.RIVER_BARRIERS:
-                if config.FORD_HEX not in current_path and config.FORD_HEX != (row, col) and config.FORD_HEX != (nr, nc):
-                    continue # Bloquear movimiento
-                cost = 2 # Penalización por cruzar río
-
-            # Modificadores para unidades slow
-            if hasattr(unit, 'slow'):
-                on_road_start = (row, col) in config.ROAD_HEXES
-                on_road_end = (nr, nc) in config.ROAD_HEXES
-
-                # Bonus: movimiento más rápido EN carretera
-                if on_road_start and on_road_end:
-                    cost = 0.75  # Mitad de costo en carretera continua
-                # Penalización: salir de carretera
-                elif on_road_start and not on_road_end:
-                    cost = 1.25  # Costo extra por dejar carretera
-
-            neighbors.append(((nr, nc), cost))
-
-        return neighbors
+                if new_dist > budget or (gated and not crossed):
+                    continue
+                # No se puede mover a través de unidades enemigas
+                neighbor_unit = grid[nr][nc]
+                if neighbor_unit and neighbor_unit.side != side:
+                    continue
+                state = (neighbor, crossed or neighbor == ford)
+                if new_dist < best.get(state, budget + 1):
+                    best[state] = new_dist
+                    previous[state] = (index, crossed)
+                    heapq.heappush(queue, (new_dist,) + state)
+
+        return MoveReach((row, col), self.cols, best, previous)
 
     def move_unit(self, from_row, from_col, to_row, to_col):
         """Mueve una unidad entre posiciones."""
@@ -171,6 +452,7 @@ class HexGrid:
         unit = self.grid[from_row][from_col]
         if unit and self.grid[to_row][to_col] is None:
             self.grid[from_row][from_col] = None
+            self._unindex_unit(from_row, from_col, unit)
             self.add_unit(to_row, to_col, unit)
             return True
         return False
@@ -186,19 +468,180 @@ class HexGrid:
     def get_adjacent_enemies(self, row, col, side):
         """Devuelve unidades enemigas adyacentes"""
         enemies = []
-        for r, c in self.get_adjacent_positions(row, col):
-            unit = self.get_unit(r, c)
+        grid = self.grid
+        for r, c in self.adjacent[row * self.cols + col]:
+            unit = grid[r][c]
             if unit and unit.side != side:
                 enemies.append(unit)
         return enemies
 
     def get_adjacent_positions(self, row, col):
-        """Devuelve posiciones adyacentes"""
-        directions = [
-            [(-1,0), (-1,1), (0,1), (1,0), (1,1), (0,-1)],  # Filas pares (indentadas)
-            [(-1,-1), (-1,0), (0,1), (1,-1), (1,0), (0,-1)]  # Filas impares
-        ]
-        return [(row + dr, col + dc) for dr, dc in directions[row % 2]]
+        """Devuelve las posiciones adyacentes dentro del tablero (tupla precalculada)"""
+        return self.adjacent[row * self.cols + col]
+
+    def distance(self, a, b):
+        """Distancia en hexágonos entre las posiciones a y b ((row, col))."""
+        cols = self.cols
+        return self._distance_list[(a[0] * cols + a[1]) * self.rows * cols + b[0] * cols + b[1]]
+
+    def flat_indices(self, positions):
+        """Devuelve un array NumPy con los índices planos de una lista de posiciones."""
+        return np.array([r * self.cols + c for r, c in positions], dtype=np.intp)
+
+    def distance_matrix(self, sources, targets):
+        """Matriz NumPy de distancias: fila por posición de sources, columna por posición de targets."""
+        return self.distances[np.ix_(self.flat_indices(sources), self.flat_indices(targets))]
+
+    def distance_field(self, targets, move_class, side=None):
+        """
+        Coste en puntos de movimiento desde cada hexágono hasta el más cercano
+        de targets, teniendo en cuenta terreno, río, vado y carretera.
+
+        Devuelve una lista indexada por row * cols + col (math.inf si no hay
+        camino). Sin side solo cuenta el terreno; con side, las unidades
+        enemigas de ese bando cortan el paso. Esta variante se guarda mientras
+        no cambien las posiciones enemigas, es decir, una vez por turno del bando.
+        """
+        targets = tuple(targets)
+        if side is None:
+            return build_distance_field(self.rows, self.cols, targets, move_class)
+
+        enemies = self._enemy_positions(side)
+        key = (targets, move_class, side)
+        cached = self._distance_fields.get(key)
+        if cached is None or cached[0] != enemies:
+            cols = self.cols
+            blocked = [r * cols + c for r, c in enemies]
+            cached = (enemies, compute_distance_field(self.rows, cols, targets, move_class, blocked))
+            self._distance_fields[key] = cached
+        return cached[1]
+
+    def find_path(self, start, targets, move_class, side=None):
+        """
+        Camino más barato [start, ..., destino] hasta el más cercano de targets,
+        con A* sobre el terreno compilado, o None si no hay camino.
+
+        La heurística es el campo de distancias solo por terreno (según se haya
+        pasado ya o no por el vado), que nunca sobreestima el coste. Con side,
+        las unidades enemigas de ese bando cortan el paso (no así las propias).
+        Los caminos se guardan mientras no cambien las posiciones enemigas, de
+        modo que todas las unidades de ambos bandos que piden la misma ruta en
+        un turno comparten un único cálculo.
+        """
+        targets = tuple(targets)
+        enemies = self._enemy_positions(side) if side is not None else frozenset()
+        cached_enemies, paths = self._paths.get(side, (None, None))
+        if cached_enemies != enemies:
+            paths = {}
+            self._paths[side] = (enemies, paths)
+        key = (start, targets, move_class)
+        if key not in paths:
+            paths[key] = self._a_star(start, targets, move_class, enemies)
+        return paths[key]
+
+    def _a_star(self, start, targets, move_class, blocked):
+        cols = self.cols
+        size = self.rows * cols
+        heuristics = (build_distance_field(self.rows, cols, targets, move_class),
+                      build_distance_field(self.rows, cols, targets, move_class, True))
+        edges = self.terrain_edges[move_class]
+        ford = config.FORD_HEX[0] * cols + config.FORD_HEX[1]
+        goals = {r * cols + c for r, c in targets}
+        blocked = {r * cols + c for r, c in blocked}
+        origin = start[0] * cols + start[1]
+        crossed = origin == ford
+        if heuristics[crossed][origin] == math.inf:
+            return None
+
+        # Estados (índice, vado) aplanados: índice + vado * size
+        best = [math.inf] * (2 * size)
+        previous = [None] * (2 * size)
+        state = origin + crossed * size
+        best[state] = 0
+        queue = [(heuristics[crossed][origin] * MOVE_COST_SCALE, 0, state)]
+        while queue:
+            _estimate, dist, state = heapq.heappop(queue)
+            if dist > best[state]:
+                continue  # Entrada obsoleta
+            crossed, index = divmod(state, size)
+            if index in goals:
+                path = []
+                while state is not None:
+                    path.append(divmod(state % size, cols))
+                    state = previous[state]
+                path.reverse()
+                return path
+
+            for neighbor, _nr, _nc, cost, gated in edges[index]:
+                if (gated and not crossed) or neighbor in blocked:
+                    continue
+                new_dist = dist + cost
+                reached = crossed or neighbor == ford
+                new_state = neighbor + reached * size
+                if new_dist < best[new_state]:
+                    best[new_state] = new_dist
+                    previous[new_state] = state
+                    estimate = new_dist + heuristics[reached][neighbor] * MOVE_COST_SCALE
+                    heapq.heappush(queue, (estimate, new_dist, new_state))
+        return None
+
+    def _enemy_positions(self, side):
+        """Posiciones de las unidades enemigas de side (frozenset)."""
+        return frozenset(pos for other, units in self.units_by_side.items() if other != side for pos in units)
+
+    def influence_map(self, side, radius):
+        """
+        Calcula de una vez la influencia de las unidades de side sobre todo el
+        tablero, multiplicando su ocupación por la máscara de radio.
+
+        Devuelve un InfluenceMap con arrays NumPy indexados por row * cols + col:
+        count (unidades a radius hexágonos o menos, sin contar la del propio
+        hexágono), power (suma de su poder) y leader_distance (distancia al
+        líder del bando, o rows * cols si no está en el tablero).
+        """
+        size = self.rows * self.cols
+        occupancy = np.zeros(size, dtype=np.int16)
+        power = np.zeros(size, dtype=np.int16)
+        leader = None
+        for (r, c), unit in self.units_by_side.get(side, {}).items():
+            index = r * self.cols + c
+            occupancy[index] = 1
+            power[index] = unit.power
+            if unit.leader:
+                leader = index
+
+        mask = build_radius_mask(self.rows, self.cols, radius)
+        leader_distance = self.distances[leader] if leader is not None else np.full(size, size, dtype=np.int16)
+        return InfluenceMap(occupancy @ mask, power @ mask, leader_distance)
+
+    def threat_map(self, side):
+        """
+        Calcula qué hexágonos podrían atacar las unidades de side en su próximo
+        turno: los que quedan adyacentes a su posición o a alguna casilla libre
+        a la que pueden llegar (get_possible_moves, con el tablero tal como
+        está ahora). Las casillas de aliados se pueden atravesar pero no
+        terminar en ellas, así que no cuentan.
+
+        Solo cuentan las unidades sanas, que son las que pueden atacar. Devuelve
+        un ThreatMap con arrays NumPy indexados por row * cols + col: count
+        (unidades que podrían atacar el hexágono) y power (suma de su poder).
+        """
+        size = self.rows * self.cols
+        count = np.zeros(size, dtype=np.int16)
+        power = np.zeros(size, dtype=np.int16)
+        neighbor_indices = self.neighbor_indices
+        cols = self.cols
+        for (r, c), unit in self.units_by_side.get(side, {}).items():
+            if unit.health != 2:
+                continue
+            attackable = set()
+            for row, col in self.get_reachable(r, c, unit.speed).costs:
+                if (row, col) == (r, c) or self.grid[row][col] is None:
+                    attackable.update(neighbor_indices[row * cols + col])
+            attackable = list(attackable)
+            count[attackable] += 1
+            power[attackable] += unit.power
+        return ThreatMap(count, power)
 
     def get_unit(self, row: int, col: int) -> Optional['Unit']:
         """Método seguro para obtener unidades"""
@@ -206,11 +649,91 @@ class HexGrid:
             return self.grid[row][col]
         return None
 
-    def eliminar_unidad(self, row, col):
+    def remove_unit(self, row, col):
+        """Retira una unidad del grid (p. ej. al llegar a Arsouf) y la devuelve."""
         unit = self.grid[row][col]
         self.grid[row][col] = None
         if unit:
-            print(_("Unidad {unit} eliminada en ({row}, {col})").format(unit=unit, row=row, col=col))
+            self._unindex_unit(row, col, unit)
+        return unit
+
+    def _unindex_unit(self, row, col, unit):
+        """Quita una unidad de los índices de posiciones y del hash."""
+        self.units_by_side[unit.side].pop((row, col), None)
+        self.units_by_type[type(unit)].pop((row, col), None)
+        self.zobrist ^= self.zobrist_pieces[row * self.cols + col][encode_unit(unit)]
+
+    def set_unit_health(self, unit, health):
+        """Cambia la salud de una unidad del tablero manteniendo el hash al día."""
+        pieces = self.zobrist_pieces[unit.row * self.cols + unit.col]
+        self.zobrist ^= pieces[encode_unit(unit)]
+        unit.health = health
+        self.zobrist ^= pieces[encode_unit(unit)]
+
+    def position_hash(self, side, phase, units_in_arsouf):
+        """
+        Hash Zobrist de 64 bits de la posición completa: unidades del tablero
+        (hexágono, tipo y salud) más el bando que mueve, la fase y los
+        contadores de Arsouf, que se combinan aquí en O(1).
+        """
+        arsouf = self.zobrist_arsouf
+        return (self.zobrist
+                ^ self.zobrist_sides[side == SIDE_SARACENS]
+                ^ self.zobrist_phases[phase == config.TURN_PHASES["COMBAT"]]
+                ^ arsouf[0][min(units_in_arsouf[config.BAGGAGE_NAME], ZOBRIST_MAX_ARSOUF - 1)]
+                ^ arsouf[1][min(units_in_arsouf["other"], ZOBRIST_MAX_ARSOUF - 1)])
+
+    def unit_positions(self, side=None, unit_type=None):
+        """
+        Devuelve las unidades del tablero como tuplas (row, col, unit), en el
+        mismo orden que un recorrido del tablero por filas.
+
+        Parámetros:
+            side (str): Filtra por bando (SIDE_CRUSADERS o SIDE_SARACENS)
+            unit_type (type): Filtra por clase de unidad (Bagaje, Ricardo...)
+        """
+        if unit_type is not None:
+            units = self.units_by_type.get(unit_type, {})
+            if side is not None:
+                return [(r, c, u) for (r, c), u in sorted(units.items()) if u.side == side]
+        elif side is not None:
+            units = self.units_by_side.get(side, {})
+        else:
+            units = {**self.units_by_side[SIDE_CRUSADERS], **self.units_by_side[SIDE_SARACENS]}
+        return [(r, c, u) for (r, c), u in sorted(units.items())]
+
+    def snapshot(self):
+        """Devuelve el contenido del tablero como BoardState compacto."""
+        return BoardState.from_grid(self)
+
+    @classmethod
+    def from_state(cls, state, rng=None):
+        """
+        Crea un tablero con unidades nuevas a partir de un BoardState.
+        Las unidades no comparten nada con las del tablero original.
+        """
+        grid = cls(rng=rng)
+        for row, col, unit_class, health in state.units():
+            unit = unit_class()
+            if health == 1:
+                # Mismo estado que deja Unit.get_wound()
+                unit.health = 1
+                unit.speed = 1
+                unit.wounded_mark = True
+            unit.charging_hex = state.charging_hex(row, col)
+            grid.add_unit(row, col, unit)
+        return grid
+
+    def find_unit(self, unit_type, side=None):
+        """Devuelve la primera unidad de un tipo como (row, col, unit), o None si no está en el tablero."""
+        units = self.unit_positions(side, unit_type)
+        return units[0] if units else None
+
+    def eliminar_unidad(self, row, col):
+        unit = self.remove_unit(row, col)
+        if unit:
+            if config.DEBUG_MODE:
+                print(_("Unidad {unit} eliminada en ({row}, {col})").format(unit=unit, row=row, col=col))
             return unit
 
     def get_units_in_radius(self, row, col, radius, side=None):
@@ -220,12 +743,8 @@ class HexGrid:
         queue = deque()
         queue.append((row, col, 0))
         visited.add((row, col))
-
-        # Definir direcciones para hex grid vertical (vértices arriba/abajo)
-        directions = [
-            [(-1, 0), (-1, 1), (0, 1), (1, 0), (1, 1), (0, -1)],  # Filas pares (indentadas)
-            [(-1, -1), (-1, 0), (0, 1), (1, -1), (1, 0), (0, -1)]  # Filas impares
-        ]
+        adjacent = self.adjacent
+        cols = self.cols
 
         while queue:
             r, c, dist = queue.popleft()
@@ -236,18 +755,16 @@ class HexGrid:
                     units.append(unit)
 
             if dist < radius:
-                dir_set = directions[r % 2]
-                for dr, dc in dir_set:
-                    nr, nc = r + dr, c + dc
-                    if (0 <= nr < self.rows and 0 <= nc < self.cols and
-                            (nr, nc) not in visited):
-                        visited.add((nr, nc))
-                        queue.append((nr, nc, dist + 1))
+                for neighbor in adjacent[r * cols + c]:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        queue.append((neighbor[0], neighbor[1], dist + 1))
 
         return units
 
     def calculate_zone_rect(self, start_col, start_row, cols, rows):
         """Calcula el rectángulo que engloba una zona del grid."""
+        import pygame
         x, y = self.hex_to_pixel(start_row, start_col)
 
         # Para hexágonos verticales, el ancho total es el número de columnas por el ancho del hexágono
@@ -260,6 +777,7 @@ class HexGrid:
         return pygame.Rect(x, y, width, height)
 
     def scale_image(img, new_size):
+        import pygame
         # Escala en pasos para mejor calidad cuando la reducción es grande
         current_size = img.get_size()
         while max(current_size) > 2 * max(new_size):
@@ -267,48 +785,33 @@ class HexGrid:
             img = pygame.transform.smoothscale(img, current_size)
         return pygame.transform.smoothscale(img, new_size)
 
-    def draw(self, screen, images, tablero_x=0, tablero_y=0):
+    def draw(self, screen, sprites, tablero_x=0, tablero_y=0, hidden=()):
         """
         Dibuja todas las unidades en el grid.
 
         Parámetros:
             screen: Superficie de Pygame donde dibujar
-            images: Diccionario de imágenes cargadas
+            sprites: SpriteCache con las imágenes de las unidades
             tablero_x: Offset horizontal del tablero (opcional)
             tablero_y: Offset vertical del tablero (opcional)
+            hidden: Unidades que no se dibujan en su casilla (por ejemplo, porque se están animando)
         """
         for row in range(self.rows):
             for col in range(self.cols):
                 unit = self.grid[row][col]
-                if unit:
+                if unit and unit not in hidden:
                     x, y = self.hex_to_pixel(row, col)
                     # Aplicar offset del tablero centrado
-                    x += tablero_x
-                    y += tablero_y
-                    img = images.get(unit.image_key)
-
-                    if img:
-                        size = int(min(config.HEX_WIDTH, config.HEX_HEIGHT) * 0.85)
-                        img = pygame.transform.smoothscale(img, (size,size))
-
-                        # Centrar la imagen en el hexágono
-                        img_x = x - img.get_width() // 2
-                        img_y = y - img.get_height() // 2
-                        screen.blit(img, (img_x, img_y))
-
-                        # Dibujar aspa roja si la unidad está herida
-                        if unit.wounded_mark:
-                            # Calcular las coordenadas para el aspa
-                            img_width = img.get_width()
-                            img_height = img.get_height()
-
-                            # Dibujar líneas diagonales (aspa)
-                            pygame.draw.line(screen, config.COMBAT_COLORS['wounded'], 
-                                           (img_x + 0.25*img_width, img_y + 0.25*img_height),
-                                           (img_x + 0.75*img_width, img_y + 0.75*img_height), 3)
-                            pygame.draw.line(screen, config.COMBAT_COLORS['wounded'], 
-                                           (img_x + 0.75*img_width, img_y + 0.25*img_height),
-                                           (img_x + 0.25*img_width, img_y + 0.75*img_height), 3)
+                    self.draw_unit(screen, sprites, unit, x + tablero_x, y + tablero_y)
+
+    @staticmethod
+    def draw_unit(screen, sprites, unit, x, y):
+        """Dibuja una unidad (con el aspa roja si está herida) centrada en el punto (x, y) de la pantalla."""
+        size = int(min(config.HEX_WIDTH, config.HEX_HEIGHT) * 0.85)
+        img = sprites.get(unit.image_key, size, unit.wounded_mark)
+        if img:
+            # Centrar la imagen en el hexágono
+            screen.blit(img, (x - img.get_width() // 2, y - img.get_height() // 2))
 
     def draw_hex_debug(self, screen, tablero_x=0, tablero_y=0):
         """
@@ -322,6 +825,7 @@ class HexGrid:
         """
         if not config.DEBUG_MODE:
             return
+        import pygame
         for row in range(self.rows):
             for col in range(self.cols):
                 # Obtener el centro del hexágono
@@ -1,6 +1,45 @@
 # main.py
+import argparse
+import multiprocessing
+from functools import partial
+
+import config
 from config import GAME_NAME, VERSION, AUTHOR
-from game import Game
+
+# Bandos que puede controlar la IA con búsqueda MCTS (--mcts)
+MCTS_SIDES = {
+    "crusaders": (config.SIDE_CRUSADERS,),
+    "saracens": (config.SIDE_SARACENS,),
+    "both": (config.SIDE_CRUSADERS, config.SIDE_SARACENS),
+}
+
+
+def parse_args(argv=None):
+    """Lee las opciones de línea de comandos."""
+    parser = argparse.ArgumentParser(description=f"{GAME_NAME} {VERSION}")
+    parser.add_argument("--selfplay", type=int, metavar="N",
+                        help="Juega N partidas IA contra IA sin interfaz y muestra estadísticas")
+    parser.add_argument("--jobs", type=int, metavar="K", default=None,
+                        help="Procesos para --selfplay (por defecto, uno por núcleo)")
+    parser.add_argument("--seed", type=int, metavar="S", default=None,
+                        help="Semilla aleatoria: reproduce la partida (o las partidas de --selfplay)")
+    parser.add_argument("--mcts", choices=sorted(MCTS_SIDES), default=None,
+                        help="Bando(s) que juega(n) con la IA de búsqueda MCTS en lugar de las reglas fijas")
+    parser.add_argument("--mcts-budget", type=float, metavar="MS", default=config.AI_MCTS_BUDGET_MS,
+                        help="Tiempo máximo de búsqueda MCTS por turno, en milisegundos")
+    parser.add_argument("--mcts-rollouts", type=int, metavar="N", default=config.AI_MCTS_ROLLOUTS,
+                        help="Máximo de simulaciones MCTS por decisión")
+    return parser.parse_args(argv)
+
+
+def mcts_players(args, jobs=None):
+    """Funciones (engine, side) -> MCTSPlayer para los bandos de --mcts."""
+    if not args.mcts:
+        return None
+    from mcts import MCTSPlayer
+    player = partial(MCTSPlayer, budget_ms=args.mcts_budget, rollouts=args.mcts_rollouts, jobs=jobs)
+    return {side: player for side in MCTS_SIDES[args.mcts]}
+
 
 def main():
     """Función principal que inicia el juego.
@@ -13,14 +52,33 @@ def main():
     4. Generar y cargar el menú de selección de bando
     5. Generar hexgrid y gameui
     6. Generar las unidades
+
+    Con --selfplay N no se abre ninguna ventana: se juegan N partidas IA contra IA
+    (ver selfplay.py).
     """
+    args = parse_args()
     print(f"{GAME_NAME} - {VERSION} by {AUTHOR}")
+
+    if args.selfplay:
+        # Importación local: las partidas sin interfaz no cargan pygame
+        from selfplay import run_selfplay, print_summary
+        # Con varias partidas en paralelo, cada MCTSPlayer simula en su propio proceso
+        players = mcts_players(args, jobs=None if args.jobs == 1 else 1)
+        print_summary(run_selfplay(args.selfplay, args.jobs, args.seed, players))
+        return
+
+    from game import Game
+
     # Crear el juego (solo inicializa lo mínimo necesario para la intro)
-    game = Game()
+    game = Game(seed=args.seed, players=mcts_players(args))
 
     # Iniciar el bucle principal del juego
     # Los componentes se cargarán bajo demanda según se necesiten
     game.run()
 
+
 if __name__ == "__main__":
+    # En el ejecutable de PyInstaller, los procesos de los pools arrancan
+    # aquí y no deben volver a lanzar el juego
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,389 @@
+# mcts.py
+"""
+IA de Arsouf basada en Monte Carlo Tree Search (MCTS).
+
+MCTSPlayer sustituye las reglas fijas de choose_strategic_move y la elección
+de objetivo en combate por una búsqueda. En cada decisión construye un árbol
+con las decisiones que le quedan al bando en la fase actual (una por unidad,
+en el orden de AIPlayer), lo recorre con UCB1 y evalúa cada hoja jugando el
+resto de la fase y unos pocos turnos más con una política rápida (al azar o
+con las reglas de AIPlayer) sobre una copia del GameState. Al final de cada
+simulación la posición se puntúa con evaluate().
+
+Las simulaciones se reparten entre procesos: cada proceso construye su propio
+árbol con otras semillas durante el mismo tiempo y después se suman las
+visitas de las acciones de la raíz (paralelización de raíz). Con más núcleos
+se simulan más partidas en el mismo tiempo y la IA juega mejor.
+"""
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import config
+import gettext
+_ = gettext.gettext
+
+from ai import AIPlayer
+from hexgrid import movement_class
+from rules import RulesEngine
+from units import Bagaje
+
+# Políticas de las simulaciones
+POLICY_RANDOM = "random"  # Acciones al azar: muchas simulaciones baratas
+POLICY_HEURISTIC = "heuristic"  # Reglas de AIPlayer: menos simulaciones, más realistas
+
+EXPLORATION = math.sqrt(2)  # Constante de exploración de UCB1
+WIDENING = 1.0  # Un nodo con n visitas puede tener 1 + WIDENING * sqrt(n) hijos
+ARSOUF_UNITS = 2  # Unidades de cada tipo (bagajes y otras) que deben llegar a Arsouf
+MAX_ARSOUF_COST = 30  # Coste (en puntos de movimiento) a partir del cual no se cuenta progreso
+STOP_POLL_S = 0.05  # Cada cuánto se comprueba, mientras esperan los procesos, si hay que cortar la búsqueda
+
+
+def evaluate(state, side):
+    """
+    Valor de una posición en [-1, 1] desde el punto de vista de side: ±1 si
+    la partida ha terminado y, si no, una mezcla de material (potencia por
+    salud de cada bando) y progreso de los Cruzados hacia Arsouf (llegadas y
+    coste restante de las unidades más cercanas).
+    """
+    if state.game_over:
+        return 1.0 if state.winner == side else -1.0
+
+    grid = state.grid
+    strength = {s: sum(unit.power * unit.health for unit in units.values())
+                for s, units in grid.units_by_side.items()}
+    total = sum(strength.values())
+    material = (strength[config.SIDE_CRUSADERS] - strength[config.SIDE_SARACENS]) / total if total else 0.0
+
+    # Progreso: cada llegada necesaria cuenta 1 y cada unidad que falta, lo
+    # que ya ha recorrido hacia Arsouf
+    costs = {True: [], False: []}
+    for row, col, unit in grid.unit_positions(config.SIDE_CRUSADERS):
+        field = grid.distance_field(state.arsouf_hexes, movement_class(unit))
+        costs[isinstance(unit, Bagaje)].append(field[row * grid.cols + col])
+    progress = 0.0
+    for is_baggage, arrived in ((True, state.units_in_arsouf[config.BAGGAGE_NAME]),
+                                (False, state.units_in_arsouf["other"])):
+        arrived = min(arrived, ARSOUF_UNITS)
+        progress += arrived
+        for cost in sorted(costs[is_baggage])[:ARSOUF_UNITS - arrived]:
+            progress += max(0.0, 1 - cost / MAX_ARSOUF_COST)
+    progress /= 2 * ARSOUF_UNITS
+
+    value = 0.5 * material + 0.5 * (2 * progress - 1)
+    return value if side == config.SIDE_CRUSADERS else -value
+
+
+def legal_actions(engine, pos):
+    """
+    Acciones de la unidad en pos en la fase actual: destinos en la fase de
+    movimiento u objetivos (posiciones) en la de combate, más None (no hacer nada).
+    """
+    state = engine.state
+    unit = state.grid.get_unit(*pos)
+    if unit is None:
+        return [None]
+    if state.turn_phase == config.TURN_PHASES["MOVEMENT"]:
+        return engine.legal_moves(*pos) + [None]
+    if unit.health != 2 or pos in state.attacked_units:
+        return [None]
+    return [(target.row, target.col) for target in state.grid.get_adjacent_enemies(pos[0], pos[1], unit.side)] + [None]
+
+
+def apply_action(engine, pos, action):
+    """Aplica una acción de legal_actions(). Si ya no es válida (otro resultado de los dados), no hace nada."""
+    if action is None or engine.state.game_over:
+        return
+    if engine.state.turn_phase == config.TURN_PHASES["MOVEMENT"]:
+        engine.move(pos, action)
+    else:
+        engine.attack(pos, action)
+
+
+class RandomPolicy:
+    """Política de simulación al azar: cualquier movimiento (o quedarse) y cualquier ataque posible."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.rng = engine.state.rng
+
+    def order(self, side):
+        return [(row, col) for row, col, _unit in self.engine.grid.unit_positions(side)]
+
+    def act(self, pos):
+        actions = legal_actions(self.engine, pos)
+        if self.engine.state.turn_phase == config.TURN_PHASES["COMBAT"] and len(actions) > 1:
+            actions.pop()  # En combate siempre se ataca si se puede
+        apply_action(self.engine, pos, self.rng.choice(actions))
+
+
+class HeuristicPolicy:
+    """Política de simulación con las reglas de AIPlayer para los dos bandos."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.players = {side: AIPlayer(engine, side) for side in (config.SIDE_CRUSADERS, config.SIDE_SARACENS)}
+
+    def order(self, side):
+        if self.engine.state.turn_phase == config.TURN_PHASES["MOVEMENT"]:
+            return [(row, col) for row, col, _unit in reversed(self.players[side].movement_order())]
+        return [(row, col) for row, col, _unit in self.players[side].combat_order()]
+
+    def act(self, pos):
+        unit = self.engine.grid.get_unit(*pos)
+        if unit is None:
+            return
+        player = self.players[unit.side]
+        if self.engine.state.turn_phase == config.TURN_PHASES["MOVEMENT"]:
+            player.move_unit(pos[0], pos[1], unit)
+        else:
+            player.attack_with(pos[0], pos[1], unit)
+
+
+POLICIES = {POLICY_RANDOM: RandomPolicy, POLICY_HEURISTIC: HeuristicPolicy}
+
+
+def rollout(engine, policy, pending, turns):
+    """
+    Termina la fase actual con las unidades de pending y sigue jugando con
+    policy hasta que acabe la partida o empiece el turno turns posterior.
+    """
+    state = engine.state
+    last_turn = state.turn_count + turns
+    positions = pending
+    while not state.game_over:
+        for pos in positions:
+            policy.act(pos)
+            if state.game_over:
+                return
+        engine.end_phase()
+        if state.turn_count >= last_turn:
+            return
+        positions = policy.order(state.current_turn_side)
+
+
+class Node:
+    """Nodo del árbol: estadísticas de la acción que lleva a él y sus hijos por acción."""
+    __slots__ = ("visits", "total", "children", "untried")
+
+    def __init__(self):
+        self.visits = 0
+        self.total = 0.0
+        self.children = {}
+        self.untried = None  # Acciones sin explorar (se calculan en la primera visita)
+
+    def can_expand(self):
+        """Ensanchamiento progresivo: se añade un hijo nuevo cuando el nodo acumula visitas suficientes."""
+        return bool(self.untried) and len(self.children) < 1 + WIDENING * math.sqrt(self.visits)
+
+    def select(self):
+        """Hijo con mayor UCB1: (acción, nodo)."""
+        log_visits = math.log(self.visits)
+        return max(self.children.items(),
+                   key=lambda item: item[1].total / item[1].visits
+                   + EXPLORATION * math.sqrt(log_visits / item[1].visits))
+
+
+def search(state, pending, budget_ms=None, rollouts=None, seed=None,
+           policy=config.AI_MCTS_POLICY, turns=config.AI_MCTS_ROLLOUT_TURNS, prior=None, stop=None):
+    """
+    MCTS en el proceso actual. El bando del turno decide, en orden, las
+    acciones de las unidades en las posiciones de pending; la primera es la
+    decisión que se busca. state no se modifica: cada simulación trabaja
+    sobre una copia con su propia semilla.
+
+    Los nodos se ensanchan poco a poco (ver Node.can_expand): con pocas
+    simulaciones solo se comparan unas cuantas acciones, empezando por prior
+    (la que propondría AIPlayer) en la raíz, y con más simulaciones se
+    consideran todas.
+
+    El árbol es de bucle abierto: una acción agrupa todos los resultados de
+    los dados, y una acción que ya no es válida en una simulación se trata
+    como no hacer nada. La búsqueda termina al agotar budget_ms, tras
+    rollouts simulaciones o cuando stop() (si se indica) devuelve True.
+
+    Devuelve {acción: (visitas, suma de valores)} de la raíz, con los valores
+    de evaluate() desde el punto de vista del bando que decide.
+    """
+    if budget_ms is None and rollouts is None:
+        raise ValueError(_("MCTS necesita un tiempo máximo o un número de simulaciones"))
+    side = state.current_turn_side
+    rng = random.Random(seed)
+    policy_class = POLICIES[policy]
+    deadline = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else math.inf
+    root = Node()
+    done = 0
+    while ((rollouts is None or done < rollouts) and time.perf_counter() < deadline
+           and not (stop is not None and stop())):
+        sim = state.clone()
+        sim.rng.seed(rng.getrandbits(64))
+        engine = RulesEngine(sim)
+
+        # Selección y expansión: bajar por el árbol hasta añadir un nodo nuevo
+        node, path, depth = root, [root], 0
+        while depth < len(pending) and not sim.game_over:
+            pos = pending[depth]
+            if node.untried is None:
+                node.untried = legal_actions(engine, pos)
+                rng.shuffle(node.untried)
+                if node is root and prior in node.untried:
+                    node.untried.remove(prior)
+                    node.untried.append(prior)  # Primera acción que se explora
+            if node.can_expand():
+                action = node.untried.pop()
+                node.children[action] = Node()
+            else:
+                action = node.select()[0]
+            apply_action(engine, pos, action)
+            node = node.children[action]
+            path.append(node)
+            depth += 1
+            if node.visits == 0:
+                break
+
+        # Simulación y retropropagación
+        if not sim.game_over:
+            rollout(engine, policy_class(engine), pending[depth:], turns)
+        value = evaluate(sim, side)
+        for node in path:
+            node.visits += 1
+            node.total += value
+        done += 1
+    return {action: (child.visits, child.total) for action, child in root.children.items()}
+
+
+_pool_stop = None  # multiprocessing.Event que corta las búsquedas en los procesos del pool
+
+
+def _init_pool_process(stop):
+    """Inicializa un proceso del pool con el evento que corta sus búsquedas."""
+    global _pool_stop
+    _pool_stop = stop
+
+
+def _pool_search(*args):
+    """search() en un proceso del pool, que se corta al activarse su evento."""
+    return search(*args, stop=_pool_stop.is_set)
+
+
+class MCTSPlayer(AIPlayer):
+    """
+    IA que elige movimientos y ataques con MCTS. El despliegue y el orden en
+    que actúan las unidades son los de AIPlayer.
+
+    El presupuesto de tiempo es por turno: cada decisión recibe lo que queda
+    repartido entre las decisiones que pueden faltar (cada unidad mueve y
+    ataca como mucho una vez). Si una búsqueda no llega a simular nada, la
+    decisión se toma con las reglas de AIPlayer. Con budget_ms=None y jobs=1
+    la partida es reproducible a partir de su semilla.
+
+    Parámetros:
+        engine (RulesEngine): Motor de reglas de la partida
+        side (str): Bando que controla la IA
+        rng (random.Random): Generador aleatorio (por defecto, el de la partida)
+        budget_ms (float): Tiempo máximo de búsqueda por turno (None: sin límite)
+        rollouts (int): Máximo de simulaciones por decisión (None: sin límite)
+        jobs (int): Procesos para las simulaciones (por defecto, uno por núcleo;
+            con 1 se simula en el proceso actual)
+        policy (str): Política de las simulaciones (POLICY_RANDOM o POLICY_HEURISTIC)
+        turns (int): Turnos que se simulan como máximo tras cada decisión
+    """
+    def __init__(self, engine, side, rng=None, budget_ms=config.AI_MCTS_BUDGET_MS,
+                 rollouts=config.AI_MCTS_ROLLOUTS, jobs=None, policy=config.AI_MCTS_POLICY,
+                 turns=config.AI_MCTS_ROLLOUT_TURNS):
+        super().__init__(engine, side, rng)
+        if budget_ms is None and rollouts is None:
+            raise ValueError(_("MCTS necesita un tiempo máximo o un número de simulaciones"))
+        self.budget_ms = budget_ms
+        self.rollouts = rollouts
+        self.jobs = jobs or os.cpu_count() or 1
+        self.policy = policy
+        self.turns = turns
+        self._pool = None
+        self._pool_stop = None
+        self._turn = None  # (turno, bando) al que corresponde el tiempo gastado
+        self._spent_ms = 0.0
+
+    def close(self):
+        """Cierra el pool de procesos de las simulaciones."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_stop = None
+
+    def choose_strategic_move(self, row, col, unit, possible_moves):
+        """Movimiento elegido por MCTS (None: quedarse), partiendo del que propone AIPlayer."""
+        prior = super().choose_strategic_move(row, col, unit, possible_moves)
+        state = self.engine.state
+        decided = self.context.get("decided", set)
+        pending = [(row, col)] + [(r, c) for r, c, _u in reversed(self.movement_order())
+                                  if (r, c) != (row, col) and (r, c) not in state.moved_units
+                                  and (r, c) not in decided]
+        # Cada unidad que falta por mover puede además atacar en la fase de combate
+        return self._search(pending, 2 * len(pending), prior)
+
+    def choose_combat_target(self, unit, adjacent_enemies):
+        """Objetivo elegido por MCTS (None: no atacar), partiendo del que propone AIPlayer."""
+        prior = super().choose_combat_target(unit, adjacent_enemies)
+        state = self.engine.state
+        decided = self.context.get("decided", set)
+        pos = (unit.row, unit.col)
+        pending = [pos] + [(r, c) for r, c, u in self.grid.unit_positions(self.side)
+                           if (r, c) != pos and u.health == 2 and (r, c) not in state.attacked_units
+                           and (r, c) not in decided and self.grid.get_adjacent_enemies(r, c, self.side)]
+        action = self._search(pending, len(pending), (prior.row, prior.col) if prior else None)
+        return self.grid.get_unit(*action) if action is not None else None
+
+    def _search(self, pending, decisions, prior):
+        """
+        Busca la acción de la unidad en pending[0]: la más visitada (a
+        igualdad, la de más valor), o prior si no da tiempo a simular nada.
+        """
+        budget_ms = self._decision_budget(decisions)
+        start = time.perf_counter()
+        state = self.engine.state
+        seeds = [self.rng.getrandbits(64) for _ in range(self.jobs)]
+        if self.jobs == 1:
+            results = [search(state, pending, budget_ms, self.rollouts, seeds[0], self.policy, self.turns, prior,
+                              self.should_stop)]
+        else:
+            if self._pool is None:
+                self._pool_stop = multiprocessing.Event()
+                self._pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_pool_process,
+                                                 initargs=(self._pool_stop,))
+            # Cada proceso hace su parte de las simulaciones con su propio árbol
+            shares = [None] * self.jobs
+            if self.rollouts is not None:
+                shares = [self.rollouts // self.jobs + (i < self.rollouts % self.jobs) for i in range(self.jobs)]
+            futures = [self._pool.submit(_pool_search, state, pending, budget_ms, share, seed, self.policy, self.turns, prior)
+                       for share, seed in zip(shares, seeds) if share != 0]
+            # Si hay que parar, los procesos terminan en el acto con lo que lleven simulado
+            running = futures
+            while running:
+                if self.should_stop():
+                    self._pool_stop.set()
+                running = wait(running, timeout=STOP_POLL_S).not_done
+            self._pool_stop.clear()
+            results = [future.result() for future in futures]
+        self._spent_ms += (time.perf_counter() - start) * 1000
+        self.context.get("decided", set).add(pending[0])
+
+        totals = {}
+        for result in results:
+            for action, (visits, total) in result.items():
+                previous = totals.get(action, (0, 0.0))
+                totals[action] = (previous[0] + visits, previous[1] + total)
+        if not totals:
+            return prior
+        return max(totals, key=lambda action: totals[action])
+
+    def _decision_budget(self, decisions):
+        """Tiempo de la próxima decisión: lo que queda del turno repartido entre las decisiones pendientes."""
+        if self.budget_ms is None:
+            return None
+        state = self.engine.state
+        turn = (state.turn_count, state.current_turn_side)
+        if self._turn != turn:
+            self._turn, self._spent_ms = turn, 0.0
+        return max(0.0, self.budget_ms - self._spent_ms) / max(1, decisions)
@@ -3,6 +3,7 @@ import pygame
 import gettext
 _ = gettext.gettext
 import config
+from fonts import get_font, render_text
 
 class Menu:
     """
@@ -13,14 +14,14 @@ class Menu:
         self.screen = screen
         # Ajustar el tamaño de la fuente según la escala de pantalla
         font_size = int(24 * config.DISPLAY_SCALING / 0.75)
-        self.font = pygame.font.SysFont('Arial', font_size)
+        self.font = get_font('Arial', font_size)
 
     def draw_button(self, rect, text, color, text_color=None):
         """Dibuja un botón con texto centrado."""
         if text_color is None:
             text_color = config.COLOR_TEXTO
         pygame.draw.rect(self.screen, color, rect)
-        button_text = self.font.render(_(text), True, text_color)
+        button_text = render_text(_(text), self.font, text_color)
         self.screen.blit(button_text, (rect.centerx - button_text.get_width()//2, 
                                      rect.centery - button_text.get_height()//2))
         return rect
@@ -38,7 +39,7 @@ class SetupMenu(Menu):
         self.screen.fill(config.COLOR_BG)
 
         # Título
-        title = self.font.render(_("Menú Principal"), True, config.COLOR_TEXTO)
+        title = render_text(_("Menú Principal"), self.font, config.COLOR_TEXTO)
         self.screen.blit(title, (config.SCREEN_WIDTH//2 - title.get_width()//2, config.TITLE_Y))
 
         # Botones del menú
@@ -112,7 +113,7 @@ class SideSelectionMenu(Menu):
         self.screen.fill(config.COLOR_BG)
 
         # Título
-        title = self.font.render(_("Selecciona tu bando:"), True, config.COLOR_TEXTO)
+        title = render_text(_("Selecciona tu bando:"), self.font, config.COLOR_TEXTO)
         self.screen.blit(title, (config.SCREEN_WIDTH//2 - title.get_width()//2, config.TITLE_Y))
 
         # Botón Cruzados
@@ -0,0 +1,389 @@
+# rules.py
+"""
+Motor de reglas de Arsouf sin dependencias de pygame.
+
+GameState agrupa todo el estado de una partida (tablero, unidades por desplegar,
+turno, fase y marcadores de Arsouf) y RulesEngine lo modifica exclusivamente a
+través de acciones explícitas (desplegar, mover, atacar, terminar fase). Game es
+solo una capa de interfaz por encima de este módulo, y las simulaciones por lotes
+pueden usarlo directamente sin abrir ventanas ni cargar recursos.
+"""
+import random
+from collections import namedtuple
+
+import config
+import gettext
+_ = gettext.gettext
+
+from hexgrid import HexGrid
+from units import *
+
+# Resultados de un movimiento
+MOVE_NORMAL = "MOVE"
+MOVE_ARSOUF = "ARSOUF"
+
+# Resultado de un ataque
+AttackResult = namedtuple("AttackResult", ["success", "charging", "eliminated"])
+
+
+def get_initial_units():
+    """Devuelve las unidades iniciales para cada bando."""
+    return {
+        config.SIDE_CRUSADERS: [
+            Ricardo(), Templario(), Hospitalario(),
+            Caballero(), Caballero(), Caballero(),
+            *[Infanteria() for _ in range(6)],
+            *[Bagaje() for _ in range(4)]
+        ],
+        config.SIDE_SARACENS: [
+            Saladino(),
+            *[Mameluco() for _ in range(4)],
+            *[Arquero() for _ in range(6)],
+            *[Explorador() for _ in range(5)]
+        ]
+    }
+
+
+def opposite_side(side):
+    """Devuelve el bando contrario."""
+    return config.SIDE_SARACENS if side == config.SIDE_CRUSADERS else config.SIDE_CRUSADERS
+
+
+class GameState:
+    """
+    Estado completo de una partida.
+
+    Toda la aleatoriedad de la partida (dados y decisiones de la IA) sale de
+    self.rng, de modo que una partida se reproduce a partir de su semilla y de
+    la secuencia de acciones.
+
+    Parámetros:
+        seed (int): Semilla del generador aleatorio (None para una semilla arbitraria)
+        grid (HexGrid): Tablero a usar (se crea uno nuevo si no se indica)
+    """
+    def __init__(self, seed=None, grid=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if grid is not None:
+            grid.rng = self.rng
+        self.grid = grid if grid is not None else HexGrid(rng=self.rng)
+        self.units_to_deploy = get_initial_units()
+
+        # Turno y fase
+        self.turn_count = 1  # Contador de turnos, empieza en 1
+        self.max_turns = config.MAX_TURNS  # Máximo de turnos permitidos
+        self.turn_phase = config.TURN_PHASES["MOVEMENT"]
+        self.first_side = None  # Bando que mueve primero en cada turno
+        self.current_turn_side = None  # Bando del turno actual
+        self.moved_units = set()  # Posiciones de unidades que ya han movido en esta fase
+        self.attacked_units = set()  # Posiciones de unidades que ya han atacado en esta fase
+
+        # Objetivos del juego
+        self.arsouf_hexes = [(1, 0), (1, 1)]  # Hexágonos de Arsouf
+        self.units_in_arsouf = {
+            config.BAGGAGE_NAME: 0,  # Contador de unidades de bagaje en Arsouf
+            "other": 0    # Contador de otras unidades en Arsouf
+        }
+        self.game_over = False
+        self.winner = None
+
+    def clone(self):
+        """
+        Copia independiente de la partida (tablero, turno, fase y generador
+        aleatorio), pensada para que la IA pueda simular jugadas sin tocar el
+        estado real. El tablero se copia a través de su BoardState compacto.
+        """
+        copy = GameState.__new__(GameState)
+        copy.__dict__.update(self.__dict__)
+        copy.rng = random.Random()
+        copy.rng.setstate(self.rng.getstate())
+        copy.grid = HexGrid.from_state(self.grid.snapshot(), rng=copy.rng)
+        copy.units_to_deploy = {side: [type(unit)() for unit in units]
+                                for side, units in self.units_to_deploy.items()}
+        copy.moved_units = set(self.moved_units)
+        copy.attacked_units = set(self.attacked_units)
+        copy.arsouf_hexes = list(self.arsouf_hexes)
+        copy.units_in_arsouf = dict(self.units_in_arsouf)
+        return copy
+
+    def __getstate__(self):
+        """
+        Estado para pickle: el tablero viaja como BoardState compacto y no
+        como HexGrid con sus tablas precalculadas, así que enviar una partida
+        a otro proceso (por ejemplo, a las simulaciones de mcts.py) cuesta
+        unos pocos KB.
+        """
+        state = self.__dict__.copy()
+        state["grid"] = self.grid.snapshot()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.grid = HexGrid.from_state(state["grid"], rng=self.rng)
+
+    def zobrist_hash(self):
+        """Hash Zobrist de 64 bits de la posición, mantenido incrementalmente por el tablero."""
+        return self.grid.position_hash(self.current_turn_side, self.turn_phase, self.units_in_arsouf)
+
+    def key(self):
+        """
+        Clave inmutable de la posición (tablero, turno, fase, bando y marcadores),
+        para detectar posiciones repetidas o usarlas como clave de un diccionario.
+        """
+        return (self.grid.snapshot().key(), self.turn_count, self.turn_phase, self.current_turn_side,
+                frozenset(self.moved_units), frozenset(self.attacked_units),
+                self.units_in_arsouf[config.BAGGAGE_NAME], self.units_in_arsouf["other"])
+
+
+class RulesEngine:
+    """
+    Aplica las reglas del juego sobre un GameState.
+
+    Parámetros:
+        state (GameState): Estado de la partida (se crea uno nuevo si no se indica)
+        log: Función que recibe los mensajes de la partida (opcional)
+        on_game_over: Función llamada con el bando ganador al terminar la partida (opcional)
+    """
+    def __init__(self, state=None, log=None, on_game_over=None):
+        self.state = state if state is not None else GameState()
+        self.log = log if log is not None else (lambda message: None)
+        self.on_game_over = on_game_over
+
+    @property
+    def grid(self):
+        return self.state.grid
+
+    # ------------------------------
+    # DESPLIEGUE
+    # ------------------------------
+    def deploy(self, unit, row, col):
+        """Coloca una unidad en su zona de despliegue. Devuelve True si era una posición válida."""
+        if self.grid.grid[row][col] is not None or not self.grid.is_in_deployment_zone(row, col, unit.side):
+            return False
+        self.grid.add_unit(row, col, unit)
+        return True
+
+    def start_play(self, first_side):
+        """Termina el despliegue y empieza el primer turno con el bando indicado."""
+        self.state.first_side = first_side
+        self.state.current_turn_side = first_side
+        self.state.turn_phase = config.TURN_PHASES["MOVEMENT"]
+        self.state.moved_units = set()
+        self.state.attacked_units = set()
+
+    # ------------------------------
+    # MOVIMIENTO
+    # ------------------------------
+    def legal_moves(self, row, col):
+        """Devuelve los destinos posibles de la unidad en (row, col) durante esta fase."""
+        unit = self.grid.get_unit(row, col)
+        if not unit or self.state.turn_phase != config.TURN_PHASES["MOVEMENT"]:
+            return []
+        return self.grid.get_possible_moves(row, col, unit.speed, self.state.moved_units)
+
+    def move_path(self, from_pos, to_pos):
+        """Camino más barato [origen, ..., destino] de un movimiento de legal_moves(), o None si no es posible."""
+        unit = self.grid.get_unit(*from_pos)
+        if not unit or self.state.turn_phase != config.TURN_PHASES["MOVEMENT"]:
+            return None
+        reach = self.grid.get_reachable(from_pos[0], from_pos[1], unit.speed, self.state.moved_units)
+        return reach.path_to(to_pos) if reach else None
+
+    def move(self, from_pos, to_pos):
+        """
+        Mueve una unidad a uno de sus destinos de legal_moves().
+
+        Devuelve MOVE_ARSOUF si la unidad ha llegado a Arsouf (y sale del tablero),
+        MOVE_NORMAL si se ha movido, o None si el movimiento no es válido.
+        """
+        row, col = from_pos
+        new_row, new_col = to_pos
+        unit = self.grid.get_unit(row, col)
+        if (not unit or self.state.game_over
+                or self.state.turn_phase != config.TURN_PHASES["MOVEMENT"]
+                or from_pos in self.state.moved_units
+                or to_pos not in self.legal_moves(row, col)):
+            return None
+
+        # Verificar si es una unidad cruzada llegando a Arsouf
+        if unit.side == config.SIDE_CRUSADERS and to_pos in self.state.arsouf_hexes:
+            self.grid.remove_unit(row, col)
+            self._unit_reaches_arsouf(unit)
+            self.check_win_condition()
+            return MOVE_ARSOUF
+
+        if not self.grid.move_unit(row, col, new_row, new_col):
+            return None
+        self.state.moved_units.add(to_pos)
+        self._set_charging_hex(row, col, new_row, new_col)
+        return MOVE_NORMAL
+
+    def undo_move(self, from_pos, to_pos):
+        """Deshace el movimiento de la unidad que fue de from_pos a to_pos."""
+        if to_pos not in self.state.moved_units:
+            return False
+        if not self.grid.move_unit(to_pos[0], to_pos[1], from_pos[0], from_pos[1]):
+            return False
+        self.state.moved_units.remove(to_pos)
+        self.grid.get_unit(*from_pos).charging_hex = None
+        return True
+
+    def _set_charging_hex(self, old_row, old_col, row, col):
+        """Fija el hexágono sobre el que un caballero cruzado está cargando"""
+        # Verificar si es un caballero cruzado para posible carga
+        moved_unit = self.grid.grid[row][col]
+        if (isinstance(moved_unit, Caballero) or
+            isinstance(moved_unit, Templario) or
+            isinstance(moved_unit, Hospitalario)):
+
+            # Diccionario de direcciones de carga posibles
+            if old_row % 2 == 0: # Fila par
+                directions = {
+                    (0, -2): (0, -3),    # O
+                    (-2, -1): (-3, -1),  # NO
+                    (-2, 1): (-3, 2),    # NE
+                    (0, 2): (0, 3),      # E
+                    (2, 1): (3, 2),      # SE
+                    (2, -1): (3, -1)     # SO
+                }
+            else: # Fila impar
+                directions = {
+                    (0, -2): (0, -3),    # O
+                    (-2, -1): (-3, -2),  # NO
+                    (-2, 1): (-3, 1),    # NE
+                    (0, 2): (0, 3),      # E
+                    (2, 1): (3, 1),      # SE
+                    (2, -1): (3, -2)     # SO
+                }
+
+            # Calcular la dirección del movimiento
+            dir = (row - old_row, col - old_col)
+
+            # Comprobar si ha movido dos casillas en la misma dirección
+            if dir in directions:
+                drow, dcol = directions[dir]
+                next_row, next_col = old_row + drow, old_col + dcol
+
+                # Verificar si el hexágono está dentro del tablero
+                if 0 <= next_row < self.grid.rows and 0 <= next_col < self.grid.cols:
+                    # Verificar si hay una unidad sarracena en ese hexágono
+                    target_unit = self.grid.get_unit(next_row, next_col)
+                    if target_unit and target_unit.side == config.SIDE_SARACENS:
+                        # Establecer el hexágono de carga
+                        moved_unit.charging_hex = (next_row, next_col)
+                        self.log(_("{unit_type} cargando sobre {target} en ({next_row},{next_col})!").format(
+                            unit_type=_(moved_unit.image_key),
+                            target=_(target_unit.image_key),
+                            next_row=next_row,
+                            next_col=next_col
+                        ))
+
+    def _unit_reaches_arsouf(self, unit):
+        """Registra una unidad que ha llegado a Arsouf"""
+        if isinstance(unit, Bagaje):
+            self.state.units_in_arsouf[config.BAGGAGE_NAME] += 1
+            self.log(_("¡Bagaje ha llegado a Arsouf! ({count}/2)").format(count=self.state.units_in_arsouf[config.BAGGAGE_NAME]))
+        else:
+            self.state.units_in_arsouf["other"] += 1
+            self.log(_("¡{unit_type} ha llegado a Arsouf! ({count}/2)").format(unit_type=_(unit.image_key), count=self.state.units_in_arsouf['other']))
+
+    # ------------------------------
+    # COMBATE
+    # ------------------------------
+    def attack(self, attacker_pos, target_pos):
+        """
+        Resuelve el ataque de la unidad en attacker_pos contra la de target_pos.
+
+        Devuelve un AttackResult, o None si el ataque no es válido (atacante herido
+        o que ya ha atacado, objetivo no adyacente o del mismo bando).
+        """
+        attacker = self.grid.get_unit(*attacker_pos)
+        target = self.grid.get_unit(*target_pos)
+        if (not attacker or not target or self.state.game_over
+                or self.state.turn_phase != config.TURN_PHASES["COMBAT"]
+                or attacker.health != 2 or attacker_pos in self.state.attacked_units
+                or target not in self.grid.get_adjacent_enemies(attacker_pos[0], attacker_pos[1], attacker.side)):
+            return None
+
+        is_charging = attacker.charge(target, self.grid)
+        success = attacker.attack(target, self.grid)
+
+        # Marcar la unidad como ya atacó este turno
+        self.state.attacked_units.add(attacker_pos)
+        return AttackResult(success, is_charging, target.health == 0)
+
+    # ------------------------------
+    # FASES Y TURNOS
+    # ------------------------------
+    def end_phase(self):
+        """Termina la fase actual. Al terminar el combate, el turno pasa al otro bando."""
+        if self.state.turn_phase == config.TURN_PHASES["MOVEMENT"]:
+            self.state.turn_phase = config.TURN_PHASES["COMBAT"]
+            self.state.moved_units = set()
+            self.state.attacked_units = set()
+            return
+
+        ending_side = self.state.current_turn_side
+        self.check_unit_recovery()
+        self.reset_charging_flags()  # Limpiar flags de carga al final de la fase de combate
+
+        self.state.turn_phase = config.TURN_PHASES["MOVEMENT"]
+        self.state.moved_units = set()
+        self.state.attacked_units = set()
+        if ending_side is not None:
+            self.state.current_turn_side = opposite_side(ending_side)
+
+        # El turno completo termina cuando ha jugado el segundo bando
+        if ending_side is not None and ending_side != self.state.first_side:
+            self.state.turn_count += 1
+            self.check_win_condition()
+
+    def check_unit_recovery(self):
+        """Verifica recuperación de todas las unidades heridas"""
+        for _row, _col, unit in self.grid.unit_positions():
+            if unit.health == 1:
+                unit.recover(self.grid)
+
+    def reset_charging_flags(self):
+        """Resetea los flags de carga de todas las unidades en el tablero"""
+        for _row, _col, unit in self.grid.unit_positions():
+            unit.charging_hex = None
+
+    # ------------------------------
+    # CONDICIONES DE VICTORIA
+    # ------------------------------
+    def check_win_condition(self):
+        """Verifica si se ha cumplido la condición de victoria"""
+        if self.state.game_over:
+            return
+
+        # Victoria de los Cruzados: 2 bagajes y 2 otras unidades en Arsouf
+        if self.state.units_in_arsouf[config.BAGGAGE_NAME] >= 2 and self.state.units_in_arsouf["other"] >= 2:
+            self._finish(config.SIDE_CRUSADERS,
+                         _("¡VICTORIA DE LOS CRUZADOS! Han llegado suficientes unidades a Arsouf."))
+            return
+
+        # Victoria de los Sarracenos: imposibilidad de que los Cruzados ganen
+        # Esto se verificaría si no quedan suficientes unidades cruzadas en el tablero
+        crusader_units = self.count_remaining_crusader_units()
+        remaining_bagaje = crusader_units[config.BAGGAGE_NAME]
+        remaining_other = crusader_units["other"]
+
+        if (remaining_bagaje + self.state.units_in_arsouf[config.BAGGAGE_NAME] < 2
+                or remaining_other + self.state.units_in_arsouf["other"] < 2
+                or self.state.turn_count > self.state.max_turns):
+            self._finish(config.SIDE_SARACENS,
+                         _("¡VICTORIA DE LOS SARRACENOS! Los Cruzados no pueden llegar a Arsouf."))
+
+    def _finish(self, winner, message):
+        self.state.game_over = True
+        self.state.winner = winner
+        self.log(message)
+        if self.on_game_over is not None:
+            self.on_game_over(winner)
+
+    def count_remaining_crusader_units(self):
+        """Cuenta las unidades cruzadas restantes en el tablero"""
+        baggage = len(self.grid.unit_positions(config.SIDE_CRUSADERS, Bagaje))
+        crusaders = len(self.grid.units_by_side[config.SIDE_CRUSADERS])
+        return {config.BAGGAGE_NAME: baggage, "other": crusaders - baggage}
@@ -0,0 +1,134 @@
+# selfplay.py
+"""
+Partidas IA contra IA sin interfaz gráfica.
+
+Cada partida enfrenta a la IA cruzada con la IA sarracena sobre el motor de
+reglas (rules.py), sin ventana, sonidos ni pausas. run_selfplay() reparte las
+partidas entre un pool de procesos y agrega los resultados (victorias, turnos,
+llegadas a Arsouf y bajas) para poder estudiar el equilibrio del juego.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import config
+import gettext
+_ = gettext.gettext
+
+from ai import AIPlayer
+from rules import GameState, RulesEngine, opposite_side
+
+
+def play_game(seed, first_side=config.SIDE_CRUSADERS, players=None):
+    """
+    Juega una partida completa entre las dos IAs y devuelve sus estadísticas.
+    La partida es determinista: la misma semilla produce siempre el mismo
+    resultado (salvo con IAs limitadas por tiempo, como MCTSPlayer).
+
+    Parámetros:
+        seed (int): Semilla de la partida
+        first_side (str): Bando que despliega y mueve primero en cada turno
+        players (dict): Función (engine, side) -> IA para cada bando que no use AIPlayer
+    """
+    engine = RulesEngine(GameState(seed))
+    second_side = opposite_side(first_side)
+    factories = players or {}
+    players = {side: factories.get(side, AIPlayer)(engine, side) for side in (first_side, second_side)}
+    initial = {side: len(units) for side, units in engine.state.units_to_deploy.items()}
+
+    # Despliegue en el mismo orden que en la partida con interfaz
+    players[first_side].deploy_all()
+    players[second_side].deploy_all()
+    engine.start_play(first_side)
+
+    while not engine.state.game_over:
+        players[engine.state.current_turn_side].play_turn()
+    for player in players.values():
+        player.close()
+
+    state = engine.state
+    on_board = {side: len(state.grid.units_by_side[side]) for side in (config.SIDE_CRUSADERS, config.SIDE_SARACENS)}
+    arrived = state.units_in_arsouf[config.BAGGAGE_NAME] + state.units_in_arsouf["other"]
+
+    return {
+        "seed": seed,
+        "winner": state.winner,
+        "first_side": first_side,
+        "turns": min(state.turn_count, state.max_turns),
+        "arsouf_baggage": state.units_in_arsouf[config.BAGGAGE_NAME],
+        "arsouf_other": state.units_in_arsouf["other"],
+        "final_hash": state.zobrist_hash(),  # Huella de la posición final (deduplicación y determinismo)
+        "losses": {
+            config.SIDE_CRUSADERS: initial[config.SIDE_CRUSADERS] - on_board[config.SIDE_CRUSADERS] - arrived,
+            config.SIDE_SARACENS: initial[config.SIDE_SARACENS] - on_board[config.SIDE_SARACENS],
+        },
+    }
+
+
+def summarize(results):
+    """Agrega las estadísticas de una lista de partidas."""
+    games = len(results)
+    sides = (config.SIDE_CRUSADERS, config.SIDE_SARACENS)
+    wins = {side: sum(1 for r in results if r["winner"] == side) for side in sides}
+    return {
+        "games": games,
+        "wins": wins,
+        "win_rate": {side: wins[side] / games if games else 0.0 for side in sides},
+        "avg_turns": sum(r["turns"] for r in results) / games if games else 0.0,
+        "avg_arsouf_baggage": sum(r["arsouf_baggage"] for r in results) / games if games else 0.0,
+        "avg_arsouf_other": sum(r["arsouf_other"] for r in results) / games if games else 0.0,
+        "avg_losses": {side: sum(r["losses"][side] for r in results) / games if games else 0.0
+                       for side in sides},
+    }
+
+
+def run_selfplay(games, jobs=None, seed=None, players=None):
+    """
+    Juega varias partidas IA contra IA repartidas entre procesos.
+
+    La partida i usa la semilla seed + i y el bando que mueve primero se alterna
+    entre partidas, así que el resultado no depende del número de procesos. Con
+    jobs=1 las partidas se juegan en el proceso actual (útil para perfilar).
+
+    Parámetros:
+        games (int): Número de partidas
+        jobs (int): Número de procesos (por defecto, uno por núcleo)
+        seed (int): Semilla base (por defecto, una aleatoria que se incluye en el resumen)
+        players (dict): Función (engine, side) -> IA para cada bando que no use
+            AIPlayer; debe poder enviarse a otros procesos (p. ej. functools.partial)
+    """
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    seeds = [seed + i for i in range(games)]
+    first_sides = [config.SIDE_CRUSADERS if i % 2 == 0 else config.SIDE_SARACENS for i in range(games)]
+    start = time.perf_counter()
+    if jobs == 1:
+        results = [play_game(game_seed, side, players) for game_seed, side in zip(seeds, first_sides)]
+    else:
+        workers = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Lotes grandes para amortizar la comunicación entre procesos
+            chunksize = max(1, games // (workers * 4))
+            results = list(pool.map(play_game, seeds, first_sides, repeat(players), chunksize=chunksize))
+    summary = summarize(results)
+    summary["seed"] = seed
+    summary["elapsed"] = time.perf_counter() - start
+    return summary
+
+
+def print_summary(summary):
+    """Muestra por consola el resumen de run_selfplay()."""
+    games = summary["games"]
+    elapsed = summary["elapsed"]
+    print(_("Partidas: {games} en {elapsed:.1f} s ({rate:.1f} partidas/s), semilla {seed}").format(
+        games=games, elapsed=elapsed, rate=games / elapsed if elapsed else 0.0, seed=summary["seed"]))
+    for side in (config.SIDE_CRUSADERS, config.SIDE_SARACENS):
+        print(_("- Victorias {side}: {wins} ({rate:.1%}), bajas medias: {losses:.2f}").format(
+            side=_(side), wins=summary["wins"][side], rate=summary["win_rate"][side],
+            losses=summary["avg_losses"][side]))
+    print(_("- Turnos medios: {turns:.2f} / {max_turns}").format(
+        turns=summary["avg_turns"], max_turns=config.MAX_TURNS))
+    print(_("- Llegadas medias a Arsouf: {baggage:.2f} bagajes, {other:.2f} otras unidades").format(
+        baggage=summary["avg_arsouf_baggage"], other=summary["avg_arsouf_other"]))
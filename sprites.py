@@ -0,0 +1,51 @@
+# sprites.py
+"""
+Caché de imágenes de unidades ya escaladas para la interfaz.
+
+Escalar con smoothscale las imágenes originales de las unidades en cada
+fotograma es la parte más cara del dibujo del tablero. SpriteCache guarda cada
+imagen escalada (y, si la unidad está herida, con el aspa roja ya dibujada)
+la primera vez que se pide, de modo que dibujar una unidad se reduce a un blit.
+"""
+import pygame
+
+import config
+
+
+class SpriteCache:
+    """
+    Imágenes de unidades escaladas, por (image_key, tamaño, herida).
+
+    Parámetros:
+        images (dict): Imágenes originales de las unidades, por image_key
+    """
+    def __init__(self, images):
+        self.images = images
+        self._sprites = {}
+
+    def get(self, image_key, size, wounded=False):
+        """Imagen de size x size píxeles (con el aspa de herida si wounded), o None si no hay imagen."""
+        key = (image_key, size, wounded)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            img = self.images.get(image_key)
+            if img is None:
+                return None
+            sprite = pygame.transform.smoothscale(img, (size, size))
+            if wounded:
+                self._draw_wound_mark(sprite)
+            self._sprites[key] = sprite
+        return sprite
+
+    @staticmethod
+    def _draw_wound_mark(sprite):
+        """Dibuja sobre sprite el aspa roja de unidad herida."""
+        width, height = sprite.get_size()
+        pygame.draw.line(sprite, config.COMBAT_COLORS['wounded'],
+                         (0.25 * width, 0.25 * height), (0.75 * width, 0.75 * height), 3)
+        pygame.draw.line(sprite, config.COMBAT_COLORS['wounded'],
+                         (0.75 * width, 0.25 * height), (0.25 * width, 0.75 * height), 3)
+
+    def clear(self):
+        """Olvida las imágenes escaladas (por ejemplo, al cambiar el tamaño de los hexágonos)."""
+        self._sprites.clear()
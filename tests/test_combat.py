@@ -0,0 +1,74 @@
+# tests/test_combat.py
+"""Probabilidades exactas de combate frente a las 36 tiradas de dados de Unit.attack."""
+import itertools
+
+import pytest
+
+import config
+from ai import AIPlayer
+from benchmark import build_board
+from combat import combat_odds
+from units import Caballero, Hospitalario, Templario
+
+
+class FixedDice:
+    """Generador que devuelve las tiradas indicadas, en orden."""
+    def __init__(self, *rolls):
+        self.rolls = list(rolls)
+
+    def randint(self, low, high):
+        return self.rolls.pop(0)
+
+
+def enumerated_odds(state, attacker_pos, target_pos):
+    """(gana, empata, pierde) de jugar el ataque con cada una de las 36 tiradas sobre copias del estado."""
+    outcomes = {"win": 0, "draw": 0, "lose": 0}
+    for attack_roll, defense_roll in itertools.product(range(1, 7), repeat=2):
+        sim = state.clone()
+        sim.grid.rng = FixedDice(attack_roll, defense_roll)
+        attacker = sim.grid.get_unit(*attacker_pos)
+        target = sim.grid.get_unit(*target_pos)
+        attacker_health, target_health = attacker.health, target.health
+        attacker.attack(target, sim.grid)
+        if target.health < target_health:
+            outcomes["win"] += 1
+        elif attacker.health < attacker_health:
+            outcomes["lose"] += 1
+        else:
+            outcomes["draw"] += 1
+    return outcomes["win"] / 36, outcomes["draw"] / 36, outcomes["lose"] / 36
+
+
+def adjacent_pairs(grid):
+    """Pares (atacante, objetivo) de unidades enemigas adyacentes."""
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            attacker = grid.grid[row][col]
+            if attacker:
+                for target in grid.get_adjacent_enemies(row, col, attacker.side):
+                    yield attacker, target
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_odds_match_dice_enumeration(seed):
+    engine = build_board(seed)
+    players = {side: AIPlayer(engine, side) for side in (config.SIDE_CRUSADERS, config.SIDE_SARACENS)}
+    checked = 0
+    for _turn in range(14):
+        if engine.state.game_over:
+            break
+        players[engine.state.current_turn_side].play_turn()
+        grid = engine.grid
+        for attacker, target in adjacent_pairs(grid):
+            attacker_pos, target_pos = (attacker.row, attacker.col), (target.row, target.col)
+            original_charge = attacker.charging_hex
+            charges = [None]
+            if isinstance(attacker, (Caballero, Templario, Hospitalario)):
+                charges.append(target_pos)  # Como si llegara cargando contra el objetivo
+            for charging_hex in charges:
+                attacker.charging_hex = charging_hex
+                odds = combat_odds(attacker, target, grid)
+                assert tuple(odds) == pytest.approx(enumerated_odds(engine.state, attacker_pos, target_pos))
+                checked += 1
+            attacker.charging_hex = original_charge
+    assert checked > 0
@@ -0,0 +1,80 @@
+# tests/test_hexgrid.py
+"""Geometría del tablero hexagonal."""
+import random
+from collections import deque
+
+import config
+from hexgrid import HexGrid
+
+
+def offset_to_cube(row, col):
+    """Coordenadas cúbicas (x, y, z) de un hexágono con las filas pares indentadas."""
+    x = col - (row + (row & 1)) // 2
+    z = row
+    return x, -x - z, z
+
+
+def test_distance_matches_cube_distance():
+    grid = HexGrid()
+    positions = [(row, col) for row in range(grid.rows) for col in range(grid.cols)]
+    for a in positions:
+        ax, ay, az = offset_to_cube(*a)
+        for b in positions:
+            bx, by, bz = offset_to_cube(*b)
+            assert grid.distance(a, b) == max(abs(ax - bx), abs(ay - by), abs(az - bz)), (a, b)
+
+
+def test_distance_matches_steps_between_neighbors():
+    """La distancia es el número de pasos entre vecinos (get_adjacent_positions) en el tablero vacío."""
+    grid = HexGrid()
+    for start in [(0, 0), (7, 10), (14, 21), (3, 18)]:
+        steps = {start: 0}
+        queue = deque([start])
+        while queue:
+            pos = queue.popleft()
+            for neighbor in grid.get_adjacent_positions(*pos):
+                if neighbor not in steps:
+                    steps[neighbor] = steps[pos] + 1
+                    queue.append(neighbor)
+        for pos, count in steps.items():
+            assert grid.distance(start, pos) == count, (start, pos)
+
+
+def test_pixel_to_hex_returns_hex_centers():
+    grid = HexGrid()
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            assert grid.pixel_to_hex(*grid.hex_to_pixel(row, col)) == (row, col)
+
+
+def test_pixel_to_hex_matches_nearest_center():
+    """
+    Coincide con la búsqueda original (círculo inscrito alrededor de cada
+    centro) allí donde esta encontraba un hexágono, y en el resto del tablero
+    devuelve el hexágono de centro más cercano.
+    """
+    grid = HexGrid()
+    centers = {(row, col): grid.hex_to_pixel(row, col) for row in range(grid.rows) for col in range(grid.cols)}
+    min_x = min(x for x, _y in centers.values())
+    max_x = max(x for x, _y in centers.values())
+    min_y = min(y for _x, y in centers.values())
+    max_y = max(y for _x, y in centers.values())
+    rng = random.Random(0)
+    for _i in range(5000):
+        x, y = rng.uniform(min_x, max_x), rng.uniform(min_y, max_y)
+        distances = sorted((((x - cx) ** 2 + (y - cy) ** 2) ** 0.5, pos) for pos, (cx, cy) in centers.items())
+        (nearest_distance, nearest), (second_distance, _second) = distances[:2]
+        if nearest_distance < config.HEX_MIN_SIZE / 2:
+            assert grid.pixel_to_hex(x, y) == nearest, (x, y)
+        elif second_distance - nearest_distance > 1:  # Lejos del borde entre dos hexágonos
+            assert grid.pixel_to_hex(x, y) == nearest, (x, y)
+
+
+def test_pixel_to_hex_outside_grid():
+    grid = HexGrid()
+    x0, y0 = grid.hex_to_pixel(0, 0)
+    x1, y1 = grid.hex_to_pixel(grid.rows - 1, grid.cols - 1)
+    assert grid.pixel_to_hex(x0 - grid.hex_width, y0) is None
+    assert grid.pixel_to_hex(x0, y0 - grid.hex_height) is None
+    assert grid.pixel_to_hex(x1 + grid.hex_width, y1) is None
+    assert grid.pixel_to_hex(x1, y1 + grid.hex_height) is None
@@ -0,0 +1,55 @@
+# tests/test_movement.py
+"""Movimientos posibles (Dijkstra sobre el terreno compilado) frente a la búsqueda en anchura original."""
+import pytest
+
+import config
+from ai import AIPlayer
+from benchmark import build_board, legacy_possible_moves
+from hexgrid import HexGrid
+from units import Caballero, Explorador, Infanteria, Mameluco
+
+
+def midgame_grids(seed, turns=12, every=3):
+    """Tableros de una partida IA contra IA cada every turnos (el mismo grid, que sigue cambiando)."""
+    engine = build_board(seed)
+    players = {side: AIPlayer(engine, side) for side in (config.SIDE_CRUSADERS, config.SIDE_SARACENS)}
+    for turn in range(turns):
+        if engine.state.game_over:
+            return
+        players[engine.state.current_turn_side].play_turn()
+        if turn % every == every - 1:
+            yield engine.grid
+
+
+def assert_same_moves(grid, row, col, speed):
+    assert set(grid.get_possible_moves(row, col, speed)) == set(legacy_possible_moves(grid, row, col, speed)), \
+        (row, col, speed)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_mid_game_moves_match_legacy(seed):
+    """Unidades heridas, bloqueos entre aliados y enemigos y tableros a mitad de partida."""
+    for grid in midgame_grids(seed):
+        for row in range(grid.rows):
+            for col in range(grid.cols):
+                unit = grid.grid[row][col]
+                if unit:
+                    assert_same_moves(grid, row, col, unit.speed)
+
+
+@pytest.mark.parametrize("unit_class", [Infanteria, Caballero, Explorador])
+def test_moves_near_ford_and_road_match_legacy(unit_class):
+    """Cruce del río por el vado y carretera (con y sin bonus de infantería), sano y herido."""
+    start_hexes = [(row, col) for row in range(6) for col in range(12, config.HEX_COLS)
+                   if (row, col) not in config.FORBIDDEN_HEXES]
+    for blocker in (None, (1, 17), (2, 17), (3, 16)):
+        for row, col in start_hexes:
+            if (row, col) == blocker:
+                continue
+            grid = HexGrid()
+            unit = unit_class()
+            grid.add_unit(row, col, unit)
+            if blocker is not None:
+                grid.add_unit(*blocker, Mameluco())
+            for speed in (1, unit.speed):
+                assert_same_moves(grid, row, col, speed)
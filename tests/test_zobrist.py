@@ -0,0 +1,55 @@
+# tests/test_zobrist.py
+"""Hash Zobrist incremental del tablero frente al calculado desde cero."""
+import pytest
+
+import config
+from ai import AIPlayer
+from benchmark import build_board
+from boardstate import encode_unit
+
+
+def scratch_hash(grid):
+    """Hash de las unidades del tablero recorriendo todas las casillas."""
+    value = 0
+    for row in range(grid.rows):
+        for col in range(grid.cols):
+            unit = grid.grid[row][col]
+            if unit:
+                value ^= grid.zobrist_pieces[row * grid.cols + col][encode_unit(unit)]
+    return value
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_hash_after_ai_turns(seed):
+    engine = build_board(seed)
+    assert engine.grid.zobrist == scratch_hash(engine.grid)
+    players = {side: AIPlayer(engine, side) for side in (config.SIDE_CRUSADERS, config.SIDE_SARACENS)}
+    for _turn in range(16):
+        if engine.state.game_over:
+            break
+        players[engine.state.current_turn_side].play_turn()
+        assert engine.grid.zobrist == scratch_hash(engine.grid)
+        assert engine.state.clone().zobrist_hash() == engine.state.zobrist_hash()
+
+
+def test_hash_after_move_wound_and_elimination():
+    engine = build_board(0)
+    grid = engine.grid
+    row, col, unit = next((r, c, grid.grid[r][c]) for r in range(grid.rows) for c in range(grid.cols)
+                          if grid.grid[r][c] and engine.legal_moves(r, c))
+    before = grid.zobrist
+
+    # Movimiento
+    to_pos = engine.legal_moves(row, col)[0]
+    assert engine.move((row, col), to_pos)
+    assert grid.zobrist == scratch_hash(grid) != before
+
+    # Primera herida
+    unit.get_wound(grid)
+    assert unit.health == 1
+    assert grid.zobrist == scratch_hash(grid)
+
+    # Segunda herida: la unidad sale del tablero
+    unit.get_wound(grid)
+    assert grid.get_unit(*to_pos) is None
+    assert grid.zobrist == scratch_hash(grid)
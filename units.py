@@ -1,6 +1,5 @@
 # units.py
 
-import random
 import gettext
 _ = gettext.gettext  # type: callable
 
@@ -31,23 +30,16 @@ class Unit:
         self.col = col
 
     def attack(self, objetivo, grid):
-        """Devuelve True si el ataque fue exitoso"""
+        """Devuelve True si el ataque fue exitoso. Los dados usan el generador aleatorio del grid."""
         if self.health != 2:  # Solo unidades sanas pueden atacar
             return False
 
-        attack_power = self.power + random.randint(1, 6)
-
-        # Bonus por líder adyacente
-        if self._is_leader_adjacent(grid):
-            attack_power += 2
-
-        # Bonus por carga de caballería cruzada
-        is_charging = self.charge(objetivo, grid)
-        if is_charging:
-            attack_power += 1
+        rng = grid.rng
+        attack_bonus, defense_bonus = self.combat_modifiers(objetivo, grid)
+        attack_power = attack_bonus + rng.randint(1, 6)
 
         # Cálculo del poder defensivo, incluyendo bonus
-        defensa_power = objetivo.power + random.randint(1, 6) + self._get_allied_bonus(objetivo, grid)
+        defensa_power = defense_bonus + rng.randint(1, 6)
 
         if attack_power > defensa_power:
             objetivo.get_wound(grid)
@@ -56,6 +48,25 @@ class Unit:
             self.get_wound(grid)
         return False
 
+    def combat_modifiers(self, objetivo, grid, absent=()):
+        """
+        Devuelve (ataque, defensa): lo que se suma a cada dado en un ataque
+        contra objetivo, con el poder de cada unidad y todos sus bonus.
+        Las unidades de absent se tratan como si ya no estuvieran en el tablero
+        (para evaluar ataques tras bajas hipotéticas sin tocar el grid).
+        """
+        attack_power = self.power
+
+        # Bonus por líder adyacente
+        if self._is_leader_adjacent(grid, absent):
+            attack_power += 2
+
+        # Bonus por carga de caballería cruzada
+        if self.charge(objetivo, grid):
+            attack_power += 1
+
+        return attack_power, objetivo.power + self._get_allied_bonus(objetivo, grid, absent)
+
     def charge(self, objetivo, grid):
         """
         Determina si la unidad está realizando una carga contra el objetivo.
@@ -92,32 +103,32 @@ class Unit:
 
     def get_wound(self, grid):
         if self.health == 2:  # Primera herida
-            self.health = 1
+            grid.set_unit_health(self, 1)
             self.speed = 1
             self.wounded_mark = True
         else:  # Segunda herida
-            self.health = 0
+            grid.set_unit_health(self, 0)
             grid.eliminar_unidad(self.row, self.col)
 
     def recover(self, grid):
         """Intenta recuperar la unidad si no hay enemigos cerca"""
         if (self.health == 1 and 
             not self._are_enemies_close(grid, radius=3)):
-            self.health = 2
+            grid.set_unit_health(self, 2)
             self.speed = self.original_speed
             self.wounded_mark = False
             return True
         return False
 
-    def _is_leader_adjacent(self, grid):
+    def _is_leader_adjacent(self, grid, absent=()):
         # Detectar líder aliado adyacente usando el atributo leader
         for r, c in grid.get_adjacent_positions(self.row, self.col):
-            unit = grid.get_unit(r, c)
-            if unit and unit.leader and unit.side == self.side:
+            unit = grid.grid[r][c]
+            if unit and unit.leader and unit.side == self.side and unit not in absent:
                 return True
         return False
 
-    def _get_allied_bonus(self, unidad_defensora: 'Unit', grid: 'HexGrid') -> float:
+    def _get_allied_bonus(self, unidad_defensora: 'Unit', grid: 'HexGrid', absent=()) -> float:
         """Calcula el bono de defensa por unidades aliadas adyacentes a la unidad ATACANTE,
         con bono adicional si el líder está adyacente al DEFENSOR.
 
@@ -130,14 +141,15 @@ class Unit:
 
         # 1. Bono por aliados adyacentes al ATACANTE (self)
         for r, c in grid.get_adjacent_positions(self.row, self.col):
-            unidad_adyacente = grid.get_unit(r, c)
-            if unidad_adyacente and unidad_adyacente.side == self.side:  # Aliados del atacante
+            unidad_adyacente = grid.grid[r][c]
+            if unidad_adyacente and unidad_adyacente.side == self.side and unidad_adyacente not in absent:  # Aliados del atacante
                 bono_total += round(unidad_adyacente.power / 2, 1)
 
         # 2. Bono adicional si el líder está adyacente al DEFENSOR
         for r, c in grid.get_adjacent_positions(unidad_defensora.row, unidad_defensora.col):
-            unidad_adyacente = grid.get_unit(r, c)
-            if unidad_adyacente and self.is_leader(unidad_adyacente) and unidad_adyacente.side == unidad_defensora.side:
+            unidad_adyacente = grid.grid[r][c]
+            if (unidad_adyacente and self.is_leader(unidad_adyacente) and unidad_adyacente.side == unidad_defensora.side
+                    and unidad_adyacente not in absent):
                 bono_total += 2
                 break  # Solo se cuenta una vez aunque haya múltiples líderes (por seguridad)
 